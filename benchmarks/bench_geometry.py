@@ -0,0 +1,39 @@
+"""times the batched workplane orientation of geometry.plane_frames() against one call per point pair
+
+runs under plain CPython with numpy, Blender is not needed:
+python benchmarks/bench_geometry.py [N] [repetitions]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'drawchitecture'))
+import geometry
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = np.random.default_rng(0)
+    point_a = rng.uniform(-50, 50, (n, 3))
+    point_b = rng.uniform(-50, 50, (n, 3))
+
+    for mode in ('h', 'v', '3d', '3p'):
+        start = time.perf_counter()
+        for i in range(repetitions):
+            geometry.plane_frames(point_a, point_b, mode)
+        t_batch = (time.perf_counter() - start) / repetitions
+
+        start = time.perf_counter()
+        for a, b in zip(point_a, point_b):
+            geometry.plane_frames(a, b, mode)
+        t_single = time.perf_counter() - start
+
+        print('%-3s N=%d  batched %9.3f ms (%7.3f us / plane)  single calls %9.3f ms  speedup %6.1fx'
+              % (mode, n, t_batch * 1000, t_batch * 1e6 / n, t_single * 1000, t_single / t_batch))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""times plane_array() for V / H / 3D / 3-point placements on the reused workplane
+
+run headless from the repository root:
+blender --background --factory-startup --python benchmarks/bench_plane_placement.py -- [repetitions]
+"""
+import os
+import sys
+import time
+
+import bpy
+from mathutils import Vector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drawchitecture
+
+
+def main():
+    args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    repetitions = int(args[0]) if args else 200
+
+    drawchitecture.register()
+    bpy.context.scene.drawchitecture.del_stroke = False
+    drawchitecture.add_GP()
+    # first placement creates the workplane
+    drawchitecture.plane_array(Vector((0, 0.5, 0)), Vector((1, 0.5, 0)), 'bp')
+    meshes_before = len(bpy.data.meshes)
+
+    for rotation in ('v', 'h', '3d', '3p'):
+        start = time.perf_counter()
+        for i in range(repetitions):
+            p1 = Vector((i * 0.1, 0.5, i * 0.05))
+            p2 = Vector((1 + i * 0.1, 2.5, 1))
+            drawchitecture.plane_array(p1, p2, rotation)
+        t = (time.perf_counter() - start) * 1000 / repetitions
+        print('%-3s %8.4f ms per placement' % (rotation, t))
+
+    print('meshes created during placements: %d' % (len(bpy.data.meshes) - meshes_before))
+    drawchitecture.unregister()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""times import, register() and unregister() of the add-on and checks that unregister() leaves nothing behind
+
+run headless from the repository root (numpy must not be loaded by the import or register()):
+blender --background --factory-startup --python benchmarks/bench_register.py -- [cycles]
+"""
+import os
+import sys
+import time
+import types
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def leftovers(addon):
+    """returns list of what is still registered after unregister()
+    """
+    found = []
+    if hasattr(bpy.types.Scene, 'drawchitecture'):
+        found.append('Scene.drawchitecture')
+    for cls in addon.classes:
+        if cls.is_registered:
+            found.append(cls.__name__)
+    for name, handler in addon.handlers:
+        if handler in getattr(bpy.app.handlers, name):
+            found.append('%s handler %s' % (name, handler.__name__))
+    if bpy.app.timers.is_registered(addon.culling_tick):
+        found.append('timer culling_tick')
+    if bpy.app.timers.is_registered(addon.jobs.poll):
+        found.append('timer jobs.poll')
+    return found
+
+
+def numpy_loaded():
+    """returns True if the code of numpy ran (a lazy module that was not used yet does not count)
+    """
+    module = sys.modules.get('numpy')
+    return module is not None and type(module) is types.ModuleType
+
+
+def main():
+    args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    cycles = int(args[0]) if args else 20
+    numpy_before = numpy_loaded()
+
+    start = time.perf_counter()
+    import drawchitecture
+    print('import          %8.2f ms' % ((time.perf_counter() - start) * 1000))
+
+    register_ms = []
+    unregister_ms = []
+    for i in range(cycles):
+        start = time.perf_counter()
+        drawchitecture.register()
+        register_ms.append((time.perf_counter() - start) * 1000)
+        if i == 0:
+            print('numpy loaded by import + register: %s' % (numpy_loaded() and not numpy_before))
+        start = time.perf_counter()
+        drawchitecture.unregister()
+        unregister_ms.append((time.perf_counter() - start) * 1000)
+        found = leftovers(drawchitecture)
+        if found:
+            print('left after unregister(): ' + ', '.join(found))
+            return 1
+    print('register()      %8.2f ms (first), %8.2f ms (min of %d)' % (register_ms[0], min(register_ms), cycles))
+    print('unregister()    %8.2f ms (first), %8.2f ms (min of %d)' % (unregister_ms[0], min(unregister_ms), cycles))
+
+    start = time.perf_counter()
+    drawchitecture.np.zeros(1)
+    print('numpy on first use %5.2f ms' % ((time.perf_counter() - start) * 1000))
+    return 0
+
+
+if __name__ == '__main__':
+    main()
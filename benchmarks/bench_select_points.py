@@ -0,0 +1,60 @@
+"""compares reading the selected stroke points point by point with frame_points() (foreach_get)
+
+run headless from the repository root:
+blender --background --factory-startup --python benchmarks/bench_select_points.py -- [strokes] [points] [repetitions]
+"""
+import os
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drawchitecture
+from synthetic import synthetic_gp, select_points
+
+
+def selected_loop(frame):
+    """former add_workplane_3p(): checks every point in python
+    """
+    selected_points = []
+    for stroke in frame.strokes:
+        for point in stroke.points:
+            if point.select:
+                selected_points.append(point.co)
+    return selected_points[-3:]
+
+
+def selected_bulk(frame):
+    """add_workplane_3p() now: bulk read + last 3 selected points by index
+    """
+    co, select = drawchitecture.frame_points(frame)
+    return co[np.flatnonzero(select)[-3:]]
+
+
+def main():
+    args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    strokes = int(args[0]) if len(args) > 0 else 1000
+    points = int(args[1]) if len(args) > 1 else 100
+    repetitions = int(args[2]) if len(args) > 2 else 10
+
+    obj = synthetic_gp('Drawing bench', strokes=strokes, points=points)
+    select_points(obj, 3)
+    frame = obj.data.layers.active.active_frame
+
+    for name, read in (('python loop', selected_loop), ('foreach_get', selected_bulk)):
+        start = time.perf_counter()
+        result = read(frame)
+        t_first = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for i in range(repetitions):
+            result = read(frame)
+        t = (time.perf_counter() - start) * 1000 / repetitions
+        print('%-12s %d points | first call %9.2f ms | next calls %9.2f ms | %s'
+              % (name, strokes * points, t_first, t, [tuple(round(c, 3) for c in co) for co in result]))
+
+
+if __name__ == '__main__':
+    main()
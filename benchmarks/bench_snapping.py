@@ -0,0 +1,63 @@
+"""times building, incremental updates and queries of the snapping index (snapping.py)
+
+run headless from the repository root:
+blender --background --factory-startup --python benchmarks/bench_snapping.py -- [strokes] [points] [queries]
+"""
+import os
+import sys
+import time
+
+import bpy
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drawchitecture
+from drawchitecture import snapping
+from synthetic import synthetic_drawing
+
+
+def main():
+    args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    strokes = int(args[0]) if len(args) > 0 else 10000
+    points = int(args[1]) if len(args) > 1 else 100
+    queries = int(args[2]) if len(args) > 2 else 1000
+
+    drawchitecture.register()
+    bpy.ops.wm.read_homefile(use_empty=True)
+    gp_obj = synthetic_drawing(1, 1, strokes, points)[0]
+    scene = bpy.context.scene
+
+    start = time.perf_counter()
+    snapping.update(scene, rebuild=True)
+    print('build     %d points %10.1f ms' % (snapping.points_total(), (time.perf_counter() - start) * 1000))
+
+    # draw 10 more strokes: only a new part is built
+    frame = gp_obj.data.layers.active.active_frame
+    for i in range(10):
+        stroke = frame.strokes.new()
+        stroke.points.add(points)
+        stroke.points.foreach_set('co', np.random.default_rng(i).uniform(-20, 20, points * 3).astype(np.float32))
+    snapping.index['dirty'] = True
+    start = time.perf_counter()
+    snapping.update(scene)
+    print('append    10 strokes   %10.1f ms' % ((time.perf_counter() - start) * 1000))
+
+    snapping.index['dirty'] = True
+    start = time.perf_counter()
+    snapping.update(scene)
+    print('unchanged              %10.3f ms' % ((time.perf_counter() - start) * 1000))
+
+    centers = np.random.default_rng(1).uniform(-20, 20, (queries, 3)).tolist()
+    for name, query in (('nearest 3', lambda c: snapping.nearest(c, 3)),
+                        ('nearest 20', lambda c: snapping.nearest(c, 20)),
+                        ('radius 0.5', lambda c: snapping.radius(c, 0.5))):
+        start = time.perf_counter()
+        for c in centers:
+            query(c)
+        print('%-10s %10.4f ms per query' % (name, (time.perf_counter() - start) * 1000 / queries))
+    drawchitecture.unregister()
+
+
+if __name__ == '__main__':
+    main()
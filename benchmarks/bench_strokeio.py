@@ -0,0 +1,48 @@
+"""times export_strokes() and import_strokes() of a synthetic drawing
+
+run headless from the repository root:
+blender --background --factory-startup --python benchmarks/bench_strokeio.py -- [strokes] [points] [archive path]
+"""
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drawchitecture
+from synthetic import synthetic_drawing
+
+
+def main():
+    args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    strokes = int(args[0]) if len(args) > 0 else 10000
+    points = int(args[1]) if len(args) > 1 else 100
+    path = args[2] if len(args) > 2 else os.path.join(tempfile.mkdtemp(), 'bench.dtstrokes')
+
+    drawchitecture.register()
+    bpy.ops.wm.read_homefile(use_empty=True)
+    synthetic_drawing(2, 2, strokes // 4, points)
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    total = drawchitecture.export_strokes(path)
+    print('export %d points %10.1f ms, max rss +%d kB'
+          % (total, (time.perf_counter() - start) * 1000, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss))
+
+    bpy.ops.wm.read_homefile(use_empty=True)
+    start = time.perf_counter()
+    gp_objects = drawchitecture.import_strokes(path)
+    print('import %d objects %9.1f ms' % (len(gp_objects), (time.perf_counter() - start) * 1000))
+
+    if len(args) < 3:
+        shutil.rmtree(os.path.dirname(path))
+    drawchitecture.unregister()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""measures undo steps and memory of a scripted session of workplane placements
+
+every placement is called like a click in the panel (undo push requested), cycling V / H / 3D
+--baseline REF runs the same session a second time with drawchitecture.py of commit REF (e.g. b6d1ec6,
+before placements were one undo step) and prints both results
+run headless from the repository root:
+blender --background --factory-startup --python benchmarks/bench_undo.py -- [placements] [--baseline REF]
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import bpy
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+import drawchitecture
+from synthetic import synthetic_drawing, synthetic_gp
+
+# placements that exist in every version of the add-on
+OPERATORS = ('work_plane_on_stroke_2p', 'work_plane_on_stroke_2p_horizontal', 'work_plane_on_stroke_2p_3d')
+
+
+def baseline_addon(ref):
+    """returns drawchitecture.py of commit ref, imported as module drawchitecture_baseline
+    """
+    source = subprocess.check_output(('git', 'show', '%s:drawchitecture.py' % ref), cwd=REPO)
+    path = os.path.join(tempfile.mkdtemp(), 'drawchitecture_baseline.py')
+    with open(path, 'wb') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location('drawchitecture_baseline', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(label, placements):
+    """runs the placements on the current file, prints + returns placements, seconds, memory growth, undo steps
+    """
+    bpy.context.preferences.edit.undo_steps = 256
+    bpy.context.preferences.edit.undo_memory_limit = 0
+    bpy.ops.ed.undo_push(message='session start')
+
+    rss = rss_kb()
+    start = time.perf_counter()
+    for i in range(placements):
+        getattr(bpy.ops.dt, OPERATORS[i % len(OPERATORS)])('EXEC_DEFAULT', True)
+    seconds = time.perf_counter() - start
+    grown = rss_kb() - rss
+
+    steps = undo_steps(bpy.context.preferences.edit.undo_steps + 1)
+    print('%s: %d placements in %.2f s, resident memory +%d kB (%.1f kB per placement), %d undo steps '
+          '(stack limit %d)' % (label, placements, seconds, grown, grown / max(placements, 1), steps,
+                                bpy.context.preferences.edit.undo_steps))
+    return placements, seconds, grown, steps
+
+
+def rss_kb():
+    """returns current resident memory of the process in kB (Linux), 0 elsewhere
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return 0
+
+
+def undo_steps(limit):
+    """returns number of steps that can be undone (undoes them all)
+    """
+    window = bpy.context.window_manager.windows[0] if bpy.context.window_manager.windows else None
+    override = {'window': window, 'screen': window.screen} if window is not None else {}
+    steps = 0
+    while steps < limit:
+        try:
+            if bpy.ops.ed.undo(override) != {'FINISHED'}:
+                break
+        except RuntimeError:
+            break
+        steps += 1
+    return steps
+
+
+def main():
+    args = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    baseline = None
+    if '--baseline' in args:
+        i = args.index('--baseline')
+        baseline = args[i + 1]
+        del args[i:i + 2]
+    placements = int(args[0]) if args else 500
+
+    drawchitecture.register()
+    synthetic_drawing(1, 1, 50, 100)
+    bpy.context.scene.drawchitecture.del_stroke = False
+    measure('one undo step per placement', placements)
+    drawchitecture.unregister()
+
+    if baseline is not None:
+        bpy.ops.wm.read_homefile(use_empty=True)
+        addon = baseline_addon(baseline)
+        addon.register()
+        # the baseline finds the GP object by name (object + data named alike) in scene.gp_active
+        gp_obj = synthetic_gp('GP_Drawing', 1, 50, 100)
+        bpy.context.view_layer.objects.active = gp_obj
+        bpy.context.scene.gp_active = gp_obj.name
+        bpy.context.scene.del_stroke = False
+        measure('baseline %s' % baseline, placements)
+        addon.unregister()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""compares the workplane grid built by grid_mesh() with the former 4x Array-modifier plane
+
+run headless from the repository root:
+blender --background --factory-startup --python benchmarks/bench_workplane_grid.py -- [count] [repetitions]
+"""
+import os
+import resource
+import sys
+import time
+
+import bpy
+from math import cos, sin, radians
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import drawchitecture
+
+
+def argv_after_dashes():
+    """returns the arguments passed to the script after '--'
+    """
+    if '--' in sys.argv:
+        return sys.argv[sys.argv.index('--') + 1:]
+    return []
+
+
+def plane_modifiers(count):
+    """old workplane: 1x1 plane with 4 Array modifiers
+    """
+    bpy.ops.mesh.primitive_plane_add(size=1, location=(0, 0, 0))
+    obj = bpy.context.active_object
+    step = radians(90)
+    for i in range(0, 4):
+        modifier = obj.modifiers.new(name='AR' + str(i), type='ARRAY')
+        modifier.count = count if i < 2 else 2
+        modifier.relative_offset_displace[0] = cos(step * i)
+        modifier.relative_offset_displace[1] = sin(step * i)
+    return obj
+
+
+def plane_grid(count):
+    """new workplane: single grid mesh without modifiers
+    """
+    obj = bpy.data.objects.new('workplane_bench', drawchitecture.grid_mesh('workplane_bench', (count, count, 0)))
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def evaluated_size(obj):
+    """returns vertex / edge / face count and approximate bytes of the evaluated mesh
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    counts = (len(mesh.vertices), len(mesh.edges), len(mesh.polygons))
+    # float3 co + short3 normal / int2 edges / loops of 4 int2 per face (rough estimate)
+    size = counts[0] * 18 + counts[1] * 8 + counts[2] * (12 + 4 * 8)
+    obj_eval.to_mesh_clear()
+    return counts, size
+
+
+def time_updates(obj, repetitions):
+    """returns ms per transform change + depsgraph evaluation, and ms per forced geometry evaluation
+    """
+    view_layer = bpy.context.view_layer
+    start = time.perf_counter()
+    for i in range(repetitions):
+        obj.location[2] = i * 0.01
+        obj.rotation_euler[0] = i * 0.01
+        obj.scale[0] = 1 + i * 0.001
+        view_layer.update()
+    t_transform = (time.perf_counter() - start) * 1000 / repetitions
+
+    start = time.perf_counter()
+    for i in range(repetitions):
+        obj.data.update()
+        view_layer.update()
+    t_geometry = (time.perf_counter() - start) * 1000 / repetitions
+    return t_transform, t_geometry
+
+
+def main():
+    args = argv_after_dashes()
+    count = int(args[0]) if len(args) > 0 else 100
+    repetitions = int(args[1]) if len(args) > 1 else 50
+
+    for name, build in (('array modifiers', plane_modifiers), ('grid mesh', plane_grid)):
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        obj = build(count)
+        bpy.context.view_layer.update()
+        t_build = (time.perf_counter() - start) * 1000
+        t_transform, t_geometry = time_updates(obj, repetitions)
+        counts, size = evaluated_size(obj)
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        print('%-16s build %8.2f ms | transform %8.3f ms | geometry %8.3f ms | '
+              'v/e/f %d/%d/%d ~%.1f kB | max rss +%d kB'
+              % (name, t_build, t_transform, t_geometry, counts[0], counts[1], counts[2], size / 1024,
+                 rss_after - rss_before))
+        mesh = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.meshes.remove(mesh)
+
+
+if __name__ == '__main__':
+    main()
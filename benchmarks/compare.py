@@ -0,0 +1,42 @@
+"""compares two JSON results of run_benchmarks.py, runs under plain CPython:
+python benchmarks/compare.py old.json new.json [threshold in percent, default 10]
+"""
+import json
+import sys
+
+
+def load(path):
+    """returns report and median ms by (fixture, operator)
+    """
+    with open(path) as f:
+        report = json.load(f)
+    return report, {(r['fixture'], r['operator']): r.get('median_ms') for r in report['results']}
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return 2
+    threshold = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    old_report, old = load(sys.argv[1])
+    new_report, new = load(sys.argv[2])
+    print('old: %s  new: %s' % (old_report.get('commit'), new_report.get('commit')))
+
+    regressions = 0
+    for key in sorted(set(old) | set(new)):
+        t_old = old.get(key)
+        t_new = new.get(key)
+        if t_old is None or t_new is None:
+            print('%-24s %-40s %12s -> %12s' % (key[0], key[1], t_old, t_new))
+            continue
+        change = (t_new - t_old) / t_old * 100 if t_old else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print('%-24s %-40s %9.3f ms -> %9.3f ms %+7.1f %%%s' % (key[0], key[1], t_old, t_new, change, flag))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
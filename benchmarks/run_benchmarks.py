@@ -0,0 +1,264 @@
+"""times every Drawchitecture operator on synthetic drawings and on the shipped .blend files
+
+run headless from the repository root, results are written as JSON:
+blender --background --factory-startup --python benchmarks/run_benchmarks.py -- \
+    [--objects 2] [--layers 2] [--strokes 200] [--points 100] [--warmup 2] [--repetitions 10] \
+    [--blend "blend files/*.blend"] [--output bench_results.json]
+compare two result files with: python benchmarks/compare.py old.json new.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import bpy
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+import drawchitecture
+from synthetic import synthetic_drawing, select_points
+
+# stroke archive written by dt.export_strokes and read by dt.import_strokes
+ARCHIVE = os.path.join(tempfile.gettempdir(), 'dt_benchmark.dtstrokes')
+# registered operators without a case and why
+SKIPPED = {'dt.manipulate_workplane': 'modal, needs mouse events'}
+
+
+def parse_args():
+    """returns arguments passed to the script after '--'
+    """
+    parser = argparse.ArgumentParser(prog='run_benchmarks.py')
+    parser.add_argument('--objects', type=int, default=2)
+    parser.add_argument('--layers', type=int, default=2)
+    parser.add_argument('--strokes', type=int, default=200)
+    parser.add_argument('--points', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--repetitions', type=int, default=10)
+    parser.add_argument('--blend', default=os.path.join(REPO, 'blend files', '*.blend'),
+                        help='glob of .blend files replayed as fixtures, empty string to skip')
+    parser.add_argument('--output', default='bench_results.json')
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    return parser.parse_args(argv)
+
+
+def git_commit():
+    """returns the commit of the repository or None
+    """
+    try:
+        return subprocess.check_output(('git', 'rev-parse', 'HEAD'), cwd=REPO).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_none(config):
+    pass
+
+
+def prepare_archive(config):
+    """stroke archive of the current file for dt.import_strokes, returns its header as filepath
+    """
+    prepare_stroke(config)
+    drawchitecture.export_strokes(ARCHIVE)
+    return {'filepath': os.path.join(ARCHIVE, 'header.json')}
+
+
+def prepare_gp_name(config):
+    """returns the name of a GP object of the current file for dt.select_gp_object
+    """
+    prepare_stroke(config)
+    return {'gp': bpy.context.scene.drawchitecture.gp_active_object.name}
+
+
+def prepare_history(config):
+    """workplane with 2 entries in the workplane history, the position at the last one
+    """
+    wp = drawchitecture.workplane()
+    drawchitecture.history.push(bpy.context.scene, wp)
+    drawchitecture.history.push(bpy.context.scene, wp)
+
+
+def prepare_workplane(config):
+    """makes sure the workplane exists
+    """
+    drawchitecture.workplane()
+
+
+def prepare_drawing(config):
+    """fresh synthetic drawing for operators that remove objects or points
+    """
+    drawchitecture.remove_objects([o for o in bpy.data.objects if o.type == 'GPENCIL'])
+    synthetic_drawing(config.objects, config.layers, config.strokes, config.points)
+
+
+def prepare_select(config):
+    """3 selected points in the active GP, Editmode entered by the first click of the operator
+    """
+    gp_obj = bpy.context.scene.drawchitecture.gp_active_object
+    if gp_obj is not None:
+        bpy.context.view_layer.objects.active = gp_obj
+        select_points(gp_obj, 3)
+        if bpy.context.mode != 'EDIT_GPENCIL':
+            bpy.ops.dt.work_plane_points_3d()
+
+
+def prepare_stroke(config):
+    """makes sure the active GP has a last stroke for V / H / 3D and delete stroke
+    """
+    gp_obj = bpy.context.scene.drawchitecture.gp_active_object
+    if gp_obj is None or not gp_obj.data.layers.active.active_frame.strokes:
+        prepare_drawing(config)
+    bpy.context.view_layer.objects.active = bpy.context.scene.drawchitecture.gp_active_object
+
+
+# operator, keyword arguments, preparation before every run (not timed, may return more keyword arguments)
+CASES = (
+    ('dt.setup', {}, prepare_none),
+    ('dt.initialize', {}, prepare_none),
+    ('dt.work_plane_on_stroke_2p', {}, prepare_stroke),
+    ('dt.work_plane_on_stroke_2p_horizontal', {}, prepare_stroke),
+    ('dt.work_plane_on_stroke_2p_3d', {}, prepare_stroke),
+    ('dt.work_plane_points_3d', {}, prepare_select),
+    ('dt.work_plane_fit', {'source': 'STROKE'}, prepare_stroke),
+    ('dt.add_rotation', {'axis': 'z', 'rotation': 45}, prepare_none),
+    ('dt.switch_scale_and_count', {}, prepare_none),
+    ('dt.reset_scale', {}, prepare_none),
+    ('dt.delete_last_stroke', {}, prepare_stroke),
+    ('dt.add_gp_object', {}, prepare_none),
+    ('dt.remove_gp_object', {}, prepare_drawing),
+    ('dt.clear_all_objects', {}, prepare_drawing),
+    ('dt.simplify_strokes', {'epsilon': 0.005, 'scope': 'SCENE'}, prepare_drawing),
+    ('dt.reproject_strokes', {'scope': 'OBJECT', 'method': 'ORTHO'}, prepare_drawing),
+    ('dt.snap_workplane', {'count': 3, 'crossings': True}, prepare_drawing),
+    ('dt.select_gp_object', {}, prepare_gp_name),
+    ('dt.pin_workplane', {}, prepare_workplane),
+    ('dt.restore_workplane', {'step': -1}, prepare_history),
+    ('dt.export_strokes', {'filepath': ARCHIVE}, prepare_stroke),
+    ('dt.import_strokes', {}, prepare_archive),
+    # only the copy of the points + the start of the job, the analysis runs in the background
+    ('dt.analyze_strokes', {'task': 'STATS', 'scope': 'SCENE'}, prepare_stroke),
+    ('dt.cancel_jobs', {}, prepare_none),
+    ('dt.reset_diagnostics', {}, prepare_none),
+)
+
+
+def operator(idname):
+    """returns the operator function bpy.ops.<category>.<name>
+    """
+    category, name = idname.split('.')
+    return getattr(getattr(bpy.ops, category), name)
+
+
+def time_operator(idname, kwargs, prepare, config):
+    """returns timing statistics in ms of repeated calls, errors are counted instead of stopping the run
+    """
+    op = operator(idname)
+    times = []
+    errors = []
+    for i in range(config.warmup + config.repetitions):
+        try:
+            arguments = dict(kwargs, **(prepare(config) or {}))
+            start = time.perf_counter()
+            op(**arguments)
+            t = (time.perf_counter() - start) * 1000
+        except Exception as error:
+            errors.append(str(error).strip().splitlines()[-1] if str(error).strip() else type(error).__name__)
+            continue
+        if i >= config.warmup:
+            times.append(t)
+
+    result = {'operator': idname, 'repetitions': len(times), 'errors': len(errors)}
+    if errors:
+        result['error'] = errors[-1]
+    if times:
+        result.update(min_ms=min(times), median_ms=statistics.median(times), mean_ms=statistics.mean(times),
+                      max_ms=max(times))
+    return result
+
+
+def skipped_operators():
+    """returns dict of the registered operators without a case in CASES and the reason
+    """
+    timed = set(case[0] for case in CASES)
+    skipped = {}
+    for cls in drawchitecture.classes:
+        idname = getattr(cls, 'bl_idname', '')
+        if idname.startswith('dt.') and idname not in timed:
+            skipped[idname] = SKIPPED.get(idname, 'no case')
+    return skipped
+
+
+def scene_stats():
+    """returns number of GP objects, strokes and points of the current file
+    """
+    strokes = 0
+    points = 0
+    gp_objects = [o for o in bpy.data.objects if o.type == 'GPENCIL']
+    for gp_obj in gp_objects:
+        for layer in gp_obj.data.layers:
+            for frame in layer.frames:
+                strokes += len(frame.strokes)
+                points += sum(len(stroke.points) for stroke in frame.strokes)
+    return {'gp_objects': len(gp_objects), 'strokes': strokes, 'points': points}
+
+
+def run_fixture(name, config):
+    """times all operators on the current file
+    """
+    results = []
+    stats = scene_stats()
+    for idname, kwargs, prepare in CASES:
+        result = time_operator(idname, kwargs, prepare, config)
+        result['fixture'] = name
+        results.append(result)
+        print('%-24s %-40s %s' % (name, idname, ('%9.3f ms' % result['median_ms']) if 'median_ms' in result
+                                  else 'error: ' + result.get('error', '')))
+    return stats, results
+
+
+def main():
+    config = parse_args()
+    drawchitecture.register()
+    skipped = skipped_operators()
+    for idname, reason in sorted(skipped.items()):
+        print('not timed: %s (%s)' % (idname, reason))
+    fixtures = {}
+    results = []
+
+    # empty scene + synthetic drawing
+    bpy.ops.wm.read_homefile(use_empty=True)
+    synthetic_drawing(config.objects, config.layers, config.strokes, config.points)
+    name = 'synthetic %dx%dx%dx%d' % (config.objects, config.layers, config.strokes, config.points)
+    fixtures[name], fixture_results = run_fixture(name, config)
+    results.extend(fixture_results)
+
+    for path in sorted(glob.glob(config.blend)) if config.blend else ():
+        bpy.ops.wm.open_mainfile(filepath=path)
+        name = os.path.basename(path)
+        fixtures[name], fixture_results = run_fixture(name, config)
+        results.extend(fixture_results)
+
+    report = {
+        'commit': git_commit(),
+        'blender': bpy.app.version_string,
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': vars(config),
+        'fixtures': fixtures,
+        'results': results,
+        'skipped': skipped,
+    }
+    with open(config.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print('results written to ' + config.output)
+    drawchitecture.unregister()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""synthetic grease pencil drawings for the benchmarks, needs Blender
+"""
+import bpy
+import numpy as np
+
+
+def synthetic_gp(name, layers=1, strokes=100, points=100, seed=0):
+    """returns new GP object at 0,0,0 with random-walk strokes on every layer (active frame 1)
+    """
+    rng = np.random.default_rng(seed)
+    gp_data = bpy.data.grease_pencil.new(name)
+    obj = bpy.data.objects.new(name, gp_data)
+    bpy.context.scene.collection.objects.link(obj)
+    obj.lock_location = [True for x in range(3)]
+
+    for i in range(layers):
+        layer = gp_data.layers.new('Layer ' + str(i + 1), set_active=True)
+        frame = layer.frames.new(bpy.context.scene.frame_current)
+        for j in range(strokes):
+            co = np.cumsum(rng.normal(0, 0.05, (points, 3)), axis=0) + rng.uniform(-20, 20, 3)
+            stroke = frame.strokes.new()
+            stroke.display_mode = '3DSPACE'
+            stroke.points.add(points)
+            stroke.points.foreach_set('co', co.astype(np.float32).ravel())
+            stroke.points.foreach_set('pressure', np.ones(points, dtype=np.float32))
+            stroke.points.foreach_set('strength', np.ones(points, dtype=np.float32))
+    return obj
+
+
+def select_points(obj, count, seed=0):
+    """selects count random points of the active frame of the active layer, deselects the others
+    """
+    rng = np.random.default_rng(seed)
+    strokes = obj.data.layers.active.active_frame.strokes
+    for stroke in strokes:
+        stroke.points.foreach_set('select', np.zeros(len(stroke.points), dtype=bool))
+    for i in rng.choice(len(strokes), count):
+        stroke = strokes[int(i)]
+        stroke.points[int(rng.integers(len(stroke.points)))].select = True
+
+
+def synthetic_drawing(objects=1, layers=1, strokes=100, points=100, seed=0):
+    """returns list of new GP objects named like add_GP() does, the last one is active + saved as active GP
+    """
+    import drawchitecture
+
+    gp_objects = []
+    for i in range(objects):
+        gp_objects.append(synthetic_gp(drawchitecture.gpencil_obj_name(), layers, strokes, points, seed + i))
+    bpy.context.view_layer.objects.active = gp_objects[-1]
+    bpy.context.scene.drawchitecture.gp_active_object = gp_objects[-1]
+    return gp_objects
@@ -0,0 +1,2020 @@
+bl_info = {
+    "name": "Drawchitecture",
+    "description": "creates temporary workplanes by strokes or points for drawing in 3D with the grease pencil",
+    "author": "Philipp Sommer",
+    "version": (1, 1),
+    "blender": (2, 80, 0),
+    "location": "View3D",
+    # "warning": "", # used for warning icon and text in addons panel
+    # "wiki_url": ""
+    # "tracker_url": "",
+    "support": "TESTING",
+    "category": "Paint"
+}
+import bpy
+import functools
+import importlib.util
+import math
+import os
+import sys
+import types
+
+from bpy.app.handlers import persistent
+from bpy.types import Panel
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+from mathutils import Vector, Matrix
+
+from . import diagnostics, history, jobs, strokelistener
+
+
+def lazy_module(name):
+    """returns module name ('.name': module of this package), its code runs on first attribute access
+    keeps numpy and the numpy based modules out of Blender start + register()
+    """
+    name = importlib.util.resolve_name(name, __name__)
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def loaded(module):
+    """returns True if the code of a lazy_module() ran already
+    """
+    return type(module) is types.ModuleType
+
+
+np = lazy_module('numpy')
+analysis = lazy_module('.analysis')
+culling = lazy_module('.culling')
+geometry = lazy_module('.geometry')
+intersections = lazy_module('.intersections')
+snapping = lazy_module('.snapping')
+strokecache = lazy_module('.strokecache')
+strokeio = lazy_module('.strokeio')
+
+
+def object_valid(obj):
+    """returns True if obj is an object that was not removed since it was looked up
+    """
+    try:
+        return obj is not None and obj.name is not None
+    except ReferenceError:
+        return False
+
+
+def poll_gpencil(self, obj):
+    """only GP objects can be saved as active GP
+    """
+    return obj.type == 'GPENCIL'
+
+
+def update_offset(self, context):
+    """updates the position of the plane when the Factor in UI is change
+    """
+    # cached workplane, no scan of all objects for every slider tick
+    wp = scene_index(self.id_data)['workplane']
+    if not object_valid(wp):
+        # removed since the last depsgraph update (clear all objects)
+        wp = bpy.data.objects.get('workplane_TEMPORARY')
+    if wp is not None:
+        # rotation in euler
+        eu = wp.rotation_euler
+        # offset factor in UI
+        factor_offset = self.plane_offset
+        # Defining Vector for Translation in Z Axis and rotating it to be the normal of the plane
+        vec_offset = Vector((0, 0, factor_offset))
+        vec_offset.rotate(eu)
+
+        loc = self.plane_location
+        vec_loc = Vector((loc[0], loc[1], loc[2]))
+        wp.location = vec_loc + vec_offset
+
+
+def update_grid(self, context):
+    """rebuilds the grid of the plane when count or edge only setting in UI is changed
+    """
+    if 'workplane_TEMPORARY' in bpy.data.objects:
+        add_grid(bpy.data.objects['workplane_TEMPORARY'])
+
+
+def update_culling(self, context):
+    """culled layers are restored when culling is switched off, else culled again with the next culling_tick()
+    """
+    if self.cull_mode == 'OFF':
+        culling.restore()
+    culling.state['key'] = None
+
+
+def update_intersections(self, context):
+    """adds / removes the markers at the crossings of the strokes with the workplane
+    """
+    if self.show_intersections:
+        intersections.show()
+    elif loaded(intersections):
+        intersections.hide()
+
+
+class DrawchitectureSettings(bpy.types.PropertyGroup):
+    """state of the add-on in the scene: scene.drawchitecture
+    """
+    gp_active_object: bpy.props.PointerProperty(type=bpy.types.Object, name='gp_active_object',
+                                                description='saves last used GP (survives renaming)',
+                                                poll=poll_gpencil, options={'HIDDEN'})
+    del_stroke: bpy.props.BoolProperty(name='del_stroke', description='V/H/3D: deletes last stroke',
+                                       default=False, options={'HIDDEN'})
+    expand_system: bpy.props.BoolProperty(name='expand_system', description='expands system tools',
+                                          default=True, options={'HIDDEN'})
+    expand_grid: bpy.props.BoolProperty(name='expand_grid', description='expands grid settings',
+                                        default=True, options={'HIDDEN'})
+    expand_analysis: bpy.props.BoolProperty(name='expand_analysis', description='expands background analysis',
+                                            default=False, options={'HIDDEN'})
+    expand_diagnostics: bpy.props.BoolProperty(name='expand_diagnostics', description='expands operator timings',
+                                               default=False, options={'HIDDEN'})
+    diagnostics_log: bpy.props.BoolProperty(name='diagnostics_log',
+                                            description='writes operator timings to a json lines file '
+                                                        'in the temp directory',
+                                            default=False, options={'HIDDEN'})
+    grid_scale: bpy.props.FloatVectorProperty(name='grid_scale', description='saves the grid size of the workplane',
+                                              default=(1.0, 1.0, 0))
+    plane_location: bpy.props.FloatVectorProperty(name='plane_location', description='global memory for wp location',
+                                                  default=(0.0, 0.0, 0.0))
+    history_pinned_only: bpy.props.BoolProperty(name='history_pinned_only',
+                                                description='previous / next workplane: only pinned workplanes',
+                                                default=False, options={'HIDDEN'})
+    snap_count: bpy.props.IntProperty(name='snap_count',
+                                      description='snap: number of stroke points next to the 3D cursor '
+                                                  'the workplane is fitted through',
+                                      default=3, min=1)
+    snap_radius: bpy.props.FloatProperty(name='snap_radius',
+                                         description='snap: use all stroke points within this distance '
+                                                     'of the 3D cursor instead (0: off)',
+                                         default=0.0, min=0.0, unit='LENGTH')
+    snap_crossings: bpy.props.BoolProperty(name='snap_crossings',
+                                           description='snap: also use the points where strokes cross '
+                                                       'the workplane',
+                                           default=False)
+    show_intersections: bpy.props.BoolProperty(name='show_intersections',
+                                               description='shows where strokes cross the workplane',
+                                               default=False, options={'HIDDEN'}, update=update_intersections)
+    fit_tolerance: bpy.props.FloatProperty(name='fit_tolerance',
+                                           description='fit: warn if the rms distance of the points to '
+                                                       'the fitted plane is larger',
+                                           default=0.02, min=0.0, unit='LENGTH')
+    fit_residual: bpy.props.FloatProperty(name='fit_residual',
+                                          description='rms distance of the points to the last fitted plane',
+                                          default=0.0, options={'HIDDEN'})
+    fit_planarity: bpy.props.FloatProperty(name='fit_planarity',
+                                           description='planarity of the points of the last fitted plane '
+                                                       '(1: all points in one plane)',
+                                           default=1.0, options={'HIDDEN'})
+    grid_count: bpy.props.IntVectorProperty(name='grid_count', description='saves the grid size of the workplane',
+                                            default=(100, 100, 0), update=update_grid)
+    grid_edge_only: bpy.props.BoolProperty(name='grid_edge_only',
+                                           description='workplane without face, '
+                                                       'strokes are not placed on its surface',
+                                           default=False, update=update_grid)
+    plane_offset: bpy.props.FloatProperty(name='plane_offset', description='plane offset in normal-direction of plane',
+                                          default=0.0, update=update_offset)
+    auto_workplane: bpy.props.EnumProperty(name='auto_workplane',
+                                           items=(('OFF', 'off', 'workplanes are only added by the buttons'),
+                                                  ('V', 'V', 'vertical workplane at every new stroke'),
+                                                  ('H', 'H', 'horizontal workplane at every new stroke'),
+                                                  ('3D', '3D', 'tilted workplane at every new stroke')),
+                                           default='OFF')
+    auto_min_length: bpy.props.FloatProperty(name='auto_min_length',
+                                             description='auto workplane: only strokes whose end points are '
+                                                         'farther apart',
+                                             default=0.2, min=0.0, unit='LENGTH')
+    cull_mode: bpy.props.EnumProperty(name='cull_mode',
+                                      items=(('OFF', 'off', 'all layers are drawn'),
+                                             ('HIDE', 'hide', 'hides layers far from the workplane or '
+                                                              'outside the view'),
+                                             ('DIM', 'dim', 'dims layers far from the workplane or '
+                                                            'outside the view')),
+                                      default='OFF', update=update_culling)
+    cull_distance: bpy.props.FloatProperty(name='cull_distance',
+                                           description='culls layers farther away from the plane of the '
+                                                       'workplane, along its normal (0: off)',
+                                           default=20.0, min=0.0, unit='LENGTH', update=update_culling)
+    cull_frustum: bpy.props.BoolProperty(name='cull_frustum', description='culls layers outside the 3D view',
+                                         default=False, update=update_culling)
+    cull_opacity: bpy.props.FloatProperty(name='cull_opacity', description='opacity factor of dimmed layers',
+                                          default=0.15, min=0.0, max=1.0, update=update_culling)
+
+
+def activate_gp():
+    """activate last GP or create GP
+    """
+    gp_obj = bpy.context.scene.drawchitecture.gp_active_object
+    if gp_obj is None:
+        # if gp objects exist choose random gp object if not yet initialized as active gp object
+        for obj in bpy.context.view_layer.objects:
+            if obj.type == 'GPENCIL':
+                bpy.context.scene.drawchitecture.gp_active_object = obj
+                bpy.context.view_layer.objects.active = obj
+                return {'FINISHED'}
+        # if no gp objects exist add new gp object
+        print('activate_gp: no gp object detected, creating new GP')
+        add_GP()
+        return {'GP added'}
+    else:
+        # if the saved GP is still part of the scene, activate it
+        if gp_obj.name in bpy.context.view_layer.objects:
+            bpy.context.view_layer.objects.active = gp_obj
+            return {'FINISHED'}
+        else:
+            print('activate_gp: gp object not found, creating new GP')
+            add_GP()
+            return {'GP added'}
+
+
+def add_grid(obj):
+    """ replace the mesh of Object (Plane) by a grid-like mesh to achieve grid-like-Workplane
+    """
+    # array modifiers of workplanes saved before grid_mesh() would repeat the whole grid
+    obj.modifiers.clear()
+    mesh_old = obj.data
+    settings = bpy.context.scene.drawchitecture
+    obj.data = grid_mesh(obj.name, settings.grid_count, settings.grid_edge_only)
+    if mesh_old.users == 0:
+        bpy.data.meshes.remove(mesh_old)
+
+
+def add_GP():
+    """Create standard GP object
+    """
+    deselect_all()
+    name = gpencil_obj_name()
+
+    # adding new GP Object
+    bpy.ops.object.gpencil_add(location=(0, 0, 0), rotation=(0, 0, 0), type='EMPTY')
+    # empty Grease Pencil Object at 0,0,0 otherwise gp stroke point coordinates are offset
+    gp_obj = bpy.context.view_layer.objects.active
+    # name + Number, grease_pencil datablock of the object gets the same name
+    gp_obj.name = name
+    gp_obj.data.name = name
+    # lock in place at 0,0,0 because point.coordinates refer to GP Origin
+    gp_obj.lock_location = [True for x in range(3)]
+    save_active_gp()
+
+
+def add_workplane_3p():
+    """Creates Plane through 3 selected points of active GP Object (selected in Editmode)
+    """
+    selected_points = np.zeros((0, 3), dtype=np.float32)
+
+    gp_obj = bpy.context.view_layer.objects.active
+    if gp_obj is None or gp_obj.type != 'GPENCIL':
+        gp_obj = bpy.context.scene.drawchitecture.gp_active_object
+
+    if gp_obj is not None:
+        gp_pen = gp_obj.data
+        if gp_pen.layers.active:
+            if gp_pen.layers.active.active_frame.strokes:
+                co, select = frame_points(gp_pen.layers.active.active_frame)
+                # last 3 selected points in order of strokes and points
+                selected_points = co[np.flatnonzero(select)[-3:]]
+
+    print('add_workplane_3p: last selected points:')
+    print(selected_points)
+    if len(selected_points) == 0:
+        print('no point selected')
+    elif len(selected_points) == 1:
+        print('1 point selected - creating horizontal plane')
+        select_p1 = selected_points[-1]
+        plane_array(select_p1, (0, 0, 0), '1p')
+        gpencil_paint_mode()
+
+    elif len(selected_points) == 2:
+        print('2 points selected - creating plane through 2 points')
+        select_p1 = selected_points[-1]
+        select_p2 = selected_points[-2]
+        plane_array(select_p1, select_p2, '3d')
+        gpencil_paint_mode()
+
+    elif len(selected_points) >= 3:
+        print('3 or more points selected - creating plane through 3 points')
+        select_p1 = selected_points[-1]
+        select_p2 = selected_points[-2]
+        select_p3 = selected_points[-3]
+        v_normal = geometry.normal_3p(select_p1, select_p2, select_p3)[0]
+        p_normal = select_p1 + v_normal
+        plane_array(select_p1, p_normal, '3p')
+        gpencil_paint_mode()
+
+    return {'FINISHED'}
+
+
+def analysis_fit_apply(result):
+    """jobs callback (main thread): workplane through the points fitted by analysis.fit() as one undo step
+    """
+    centroid, normal, rms, planarity, count = result
+    if count < 3 or planarity == 0:
+        return 'needs at least 3 points that are not on a line'
+    settings = bpy.context.scene.drawchitecture
+    settings.fit_residual = rms
+    settings.fit_planarity = planarity
+    plane_array(centroid, centroid + normal, '3p', delete_stroke=False)
+    try:
+        bpy.ops.ed.undo_push(message='fit workplane (analysis)')
+    except RuntimeError:
+        pass
+    return 'workplane fitted through %d points, rms %.3f m' % (count, rms)
+
+
+def analysis_simplify_apply(result):
+    """jobs callback (main thread): message of analysis.simplify_preview()
+    """
+    before, after = result
+    return '%d of %d points would be kept (-%d%%)' % (after, before, 100 * (before - after) // max(before, 1))
+
+
+def analysis_stats_apply(result):
+    """jobs callback (main thread): message of analysis.stats()
+    """
+    if not result['points']:
+        return 'no points'
+    size = result['bbox_max'] - result['bbox_min']
+    return ('%d strokes, %d points, %.1f m drawn, %d planar, %.1f x %.1f x %.1f m'
+            % (result['strokes'], result['points'], result['length'], result['planar'], size[0], size[1], size[2]))
+
+
+def auto_workplane(record):
+    """strokelistener callback: workplane at the stroke just drawn, if auto workplane is on and the stroke
+    is long enough, placed by a timer right after the depsgraph update
+    """
+    settings = bpy.context.scene.drawchitecture
+    if settings.auto_workplane == 'OFF' or record['first'] is None:
+        return
+    if (Vector(record['last']) - Vector(record['first'])).length < settings.auto_min_length:
+        return
+    bpy.app.timers.register(functools.partial(auto_workplane_place, record['first'], record['last'],
+                                              settings.auto_workplane.lower()), first_interval=0.0)
+
+
+def auto_workplane_place(p1, p2, rotation):
+    """timer of auto_workplane(): places the workplane (the stroke is kept) as one undo step
+    """
+    plane_array(p1, p2, rotation, delete_stroke=False)
+    try:
+        bpy.ops.ed.undo_push(message='auto workplane')
+    except RuntimeError:
+        pass
+    return None
+
+
+@persistent
+def caches_invalidate(scene, *args):
+    """handler (depsgraph update, undo, file load): passed on to the caches of intersections, snapping
+    + strokecache once loaded
+    """
+    for module in (intersections, snapping, strokecache):
+        if loaded(module):
+            module.invalidate(scene, *args)
+
+
+@persistent
+def culling_reset(*args):
+    """handler (file load): culling.reset() once culling is loaded
+    """
+    if loaded(culling):
+        culling.reset()
+
+
+@persistent
+def culling_restore_before_save(*args):
+    """handler (save pre): culling.restore_before_save() once culling is loaded
+    """
+    if loaded(culling):
+        culling.restore_before_save()
+
+
+@persistent
+def intersections_sync(*args):
+    """handler (file load): crossing markers as set in the loaded scene
+    """
+    scene = bpy.context.scene
+    if scene is not None and scene.drawchitecture.show_intersections:
+        intersections.show()
+    elif loaded(intersections):
+        intersections.hide()
+
+
+def culling_tick():
+    """timer (registered with the add-on): culls the layers again when the workplane or the view changed
+    """
+    scene = bpy.context.scene
+    if scene is None or scene.drawchitecture.cull_mode == 'OFF':
+        if loaded(culling) and culling.state['culled']:
+            culling.restore()
+        return 0.5
+    region_3d = getattr(find_3dview_space(), 'region_3d', None)
+    culling.update(scene, scene_index(scene)['workplane'],
+                   region_3d.perspective_matrix if region_3d is not None else None)
+    return 0.2
+
+
+def deselect_all():
+    """deselects every object
+    """
+    if not bpy.context.mode == 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.ops.object.select_all(action='DESELECT')
+
+
+def export_strokes(path, gp_objects=None):
+    """writes all strokes (every layer + frame) of the GP objects into a stroke archive at path (strokeio)
+    points are read stroke by stroke into reused buffers and streamed in chunks, returns number of points
+    gp_objects: default all GP objects of the file
+    """
+    if gp_objects is None:
+        gp_objects = [obj for obj in bpy.data.objects if obj.type == 'GPENCIL']
+    buffers = {'co': np.empty(0, dtype=np.float32), 'pressure': np.empty(0, dtype=np.float32),
+               'strength': np.empty(0, dtype=np.float32)}
+
+    with strokeio.StrokeWriter(path) as writer:
+        for gp_obj in gp_objects:
+            obj_index = writer.add_object(gp_obj.name, gp_obj.matrix_world, gp_obj.data.name)
+            for layer in gp_obj.data.layers:
+                layer_index = writer.add_layer(obj_index, layer.info)
+                for frame in layer.frames:
+                    for stroke in frame.strokes:
+                        n = len(stroke.points)
+                        if len(buffers['pressure']) < n:
+                            buffers = {'co': np.empty(3 * n, dtype=np.float32),
+                                       'pressure': np.empty(n, dtype=np.float32),
+                                       'strength': np.empty(n, dtype=np.float32)}
+                        co = buffers['co'][:3 * n]
+                        pressure = buffers['pressure'][:n]
+                        strength = buffers['strength'][:n]
+                        stroke.points.foreach_get('co', co)
+                        stroke.points.foreach_get('pressure', pressure)
+                        stroke.points.foreach_get('strength', strength)
+                        writer.add_stroke(co, pressure, strength, layer_index, frame.frame_number,
+                                          stroke.line_width)
+        return writer.points
+
+
+def find_3dview_space():
+    """returns 3D_View and its screen space
+    """
+    area = None
+
+    for a in bpy.data.window_managers[0].windows[0].screen.areas:
+        if a.type == 'VIEW_3D':
+            area = a
+            break
+    if area:
+        space = area.spaces[0]
+    else:
+        space = bpy.context.space_data
+
+    return space
+
+
+# point buffers of the last frame read by frame_points()
+frame_points_cache = {'frame': None, 'counts': None, 'offsets': None, 'co': None, 'select': None}
+
+
+def frame_points(frame):
+    """returns coordinates (N,3) and selection state (N,) of all stroke points of a GP frame
+    each stroke is read at once (foreach_get), the buffers are cached and reused as long as
+    the same frame is read and its strokes keep their number of points
+    """
+    strokes = frame.strokes
+    counts = np.fromiter((len(stroke.points) for stroke in strokes), dtype=np.int64, count=len(strokes))
+    cache = frame_points_cache
+    if cache['frame'] != frame.as_pointer() or not np.array_equal(cache['counts'], counts):
+        total = int(counts.sum())
+        cache['frame'] = frame.as_pointer()
+        cache['counts'] = counts
+        cache['offsets'] = np.concatenate(((0,), np.cumsum(counts)))
+        cache['co'] = np.empty((total, 3), dtype=np.float32)
+        cache['select'] = np.empty(total, dtype=bool)
+
+    # coordinates + selection are read again: points might be moved or selected in Editmode between clicks
+    co, select, offsets = cache['co'], cache['select'], cache['offsets']
+    for i, stroke in enumerate(strokes):
+        stroke.points.foreach_get('co', co[offsets[i]:offsets[i + 1]].ravel())
+        stroke.points.foreach_get('select', select[offsets[i]:offsets[i + 1]])
+    return co, select
+
+
+# lowest number that might still be free for gpencil_obj_name()
+gp_name_number = {'next': 1}
+
+
+def gpencil_obj_name():
+    """Generates Name 'Drawing N' for new GP object, N counts up from the last generated name
+    so only names that were taken since then (or renamed to it) have to be skipped
+    """
+    num = gp_name_number['next']
+    name = 'Drawing ' + str(num)
+    # as long as name+num is allready taken by an object or grease_pencil datablock, count up num
+    while name in bpy.data.objects or name in bpy.data.grease_pencil:
+        num = num + 1
+        name = 'Drawing ' + str(num)
+    gp_name_number['next'] = num + 1
+    return name
+
+
+def gpencil_obj_name_release(name):
+    """makes the number of a removed 'Drawing N' available again for gpencil_obj_name()
+    """
+    if name.startswith('Drawing ') and name[8:].isdigit():
+        gp_name_number['next'] = min(gp_name_number['next'], int(name[8:]))
+
+
+@persistent
+def gpencil_obj_name_reset(*args):
+    """handler (file load): count names from 'Drawing 1' again
+    """
+    gp_name_number['next'] = 1
+
+
+def gpencil_paint_mode():
+    """Gpencil has to be selected! activates DRAW mode / GPENCIL_PAINT mode, unless it's already active
+    """
+    if not bpy.context.mode == 'PAINT_GPENCIL':
+        bpy.ops.object.mode_set(mode='PAINT_GPENCIL')
+    return {'FINISHED'}
+
+
+def grid_mesh(name, count, edge_only=False):
+    """returns new mesh with a grid of 1m lines, count[0] / count[1] cells to each side of the origin
+    vertices and edges are written at once (foreach_set), no modifiers needed
+    one face spans the whole grid for stroke placement on 'SURFACE' unless edge_only
+    """
+    # same extent as the former array modifiers: origin in the middle of a cell
+    nx = 2 * max(1, count[0])
+    ny = 2 * max(1, count[1])
+    xs = np.arange(nx + 1, dtype=np.float32) - (nx / 2 + 0.5)
+    ys = np.arange(ny + 1, dtype=np.float32) - (ny / 2 + 0.5)
+
+    # vertical lines: bottom + top vertex, horizontal lines in between: left + right vertex
+    co_v = np.zeros((nx + 1, 2, 3), dtype=np.float32)
+    co_v[:, :, 0] = xs[:, None]
+    co_v[:, 0, 1] = ys[0]
+    co_v[:, 1, 1] = ys[-1]
+    co_h = np.zeros((ny - 1, 2, 3), dtype=np.float32)
+    co_h[:, 0, 0] = xs[0]
+    co_h[:, 1, 0] = xs[-1]
+    co_h[:, :, 1] = ys[1:-1, None]
+    co = np.concatenate((co_v.reshape(-1, 3), co_h.reshape(-1, 3)))
+
+    # every line is one edge, border lines at bottom / top connect the outer vertical lines
+    edges = np.arange(len(co), dtype=np.int32).reshape(-1, 2)
+    corners = np.array((0, 2 * nx, 2 * nx + 1, 1), dtype=np.int32)
+    edges = np.concatenate((edges, ((corners[0], corners[1]), (corners[3], corners[2]))))
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set('co', co.ravel())
+    mesh.edges.add(len(edges))
+    mesh.edges.foreach_set('vertices', edges.ravel())
+    if not edge_only:
+        mesh.loops.add(4)
+        mesh.loops.foreach_set('vertex_index', corners)
+        mesh.polygons.add(1)
+        mesh.polygons.foreach_set('loop_start', (0,))
+        mesh.polygons.foreach_set('loop_total', (4,))
+    mesh.update(calc_edges=True)
+    # tells workplane() the mesh is a grid and not the plane of a file saved before
+    mesh['drawchitecture_grid'] = True
+    return mesh
+
+
+def import_strokes(path):
+    """creates GP objects (like add_GP: named 'Drawing N', locked at 0,0,0) from a stroke archive (strokeio)
+    with their layers, frames and strokes, points are written per stroke with points.add + foreach_set
+    coordinates are moved to world space if the exported object was not at the origin
+    returns list of the new GP objects
+    """
+    if os.path.basename(path) == 'header.json':
+        path = os.path.dirname(path)
+    header, arrays = strokeio.read(path)
+    offsets = arrays['offsets']
+    strokes_info = arrays['strokes']
+
+    gp_objects = []
+    for info in header['objects']:
+        add_GP()
+        gp_obj = bpy.context.view_layer.objects.active
+        # only the layers of the archive
+        for layer in list(gp_obj.data.layers):
+            gp_obj.data.layers.remove(layer)
+        gp_objects.append(gp_obj)
+    layers = []
+    for info in header['layers']:
+        layers.append(gp_objects[info['object']].data.layers.new(info['name'], set_active=True))
+    matrices = []
+    for info in header['objects']:
+        matrix = np.array(info['matrix']) if info['matrix'] is not None else np.eye(4)
+        matrices.append(None if np.allclose(matrix, np.eye(4)) else matrix)
+
+    frames = {}
+    for i in range(header['strokes']):
+        layer_index, frame_number, line_width = (int(v) for v in strokes_info[i])
+        key = (layer_index, frame_number)
+        if key not in frames:
+            frames[key] = layers[layer_index].frames.new(frame_number)
+        start, end = int(offsets[i]), int(offsets[i + 1])
+
+        co = arrays['co'][start:end]
+        matrix = matrices[header['layers'][layer_index]['object']]
+        if matrix is not None:
+            co = (co @ matrix[:3, :3].T + matrix[:3, 3]).astype(np.float32)
+        stroke = frames[key].strokes.new()
+        stroke.display_mode = '3DSPACE'
+        stroke.line_width = line_width
+        stroke.points.add(end - start)
+        # native float32: no copy on little-endian machines, byte order swapped on others
+        stroke.points.foreach_set('co', np.ascontiguousarray(co, dtype=np.float32).ravel())
+        stroke.points.foreach_set('pressure', np.ascontiguousarray(arrays['pressure'][start:end], dtype=np.float32))
+        stroke.points.foreach_set('strength', np.ascontiguousarray(arrays['strength'][start:end], dtype=np.float32))
+
+    for gp_obj in gp_objects:
+        gp_obj.data.update_tag()
+    return gp_objects
+
+
+def laststroke():
+    """returns last stroke of active Greasepencil object
+    returns 'No GP object active' when no GP Obj is active
+    """
+    gp_obj = bpy.context.view_layer.objects.active
+    if gp_obj is not None and gp_obj.type == 'GPENCIL':
+        gp_pen = gp_obj.data
+        if gp_pen.layers.active:
+            if gp_pen.layers.active.active_frame.strokes:
+                ls = gp_pen.layers.active.active_frame.strokes[-1]
+                return ls
+            else:
+                print('laststroke: active GP Obj has no strokes')
+                return {'No Strokes'}
+        else:
+            print('laststroke: active GP Obj has no strokes')
+            return {'No Strokes'}
+    else:
+        print('No GP object active')
+        return {'GP obj inactive'}
+
+
+def laststroke_endpoints():
+    """returns first + last point of the last stroke of the active GP object, None if there is none
+    recorded by strokelistener when the stroke was drawn, read from strokecache otherwise
+    """
+    gp_obj = bpy.context.view_layer.objects.active
+    endpoints = strokelistener.endpoints(gp_obj)
+    if endpoints is None:
+        ls = laststroke()
+        if isinstance(ls, set) or len(ls.points) == 0:
+            return None
+        meta = strokecache.last_stroke(gp_obj)
+        endpoints = meta['first'], meta['last']
+    return endpoints
+
+
+# def offset_plane():
+#
+#    cube = bpy.data.objects["Cube"]
+#    # one blender unit in x-direction
+#    vec = mathutils.Vector((1.0, 0.0, 0.0))
+#    inv = cube.rotation_euler.to_matrix()
+#    # vec aligned to local axis
+#    vec_rot = vec * inv
+#    cube.location = cube.location + vec_rot
+
+
+def plane_array(p1, p2, rotation, delete_stroke=True):
+    """moves the grid workplane of 1m by 1m cells to given location, parameter rotation defines way to calculate angle
+    the workplane object is created once and reused, only its transform is changed
+    delete_stroke: False keeps the last stroke even if del_stroke is set
+    """
+    save_active_gp()
+    p_loc, _, p_rot = geometry.plane_frames(p1, p2, rotation)
+
+    baseplane = workplane()
+    bpy.context.scene.drawchitecture.plane_location = p_loc[0]
+    baseplane.rotation_euler = p_rot[0]
+    # moves the plane to plane_location (update_offset)
+    bpy.context.scene.drawchitecture.plane_offset = 0.0
+    baseplane.location = p_loc[0]
+    history.push(bpy.context.scene, baseplane)
+
+    activate_gp()
+    if rotation not in ('3p', 'bp') and delete_stroke:
+        if bpy.context.scene.drawchitecture.del_stroke:
+            bpy.ops.dt.delete_last_stroke()
+    return {'FINISHED'}
+
+
+# objects shown in AddPanel, filled by scene_index() and emptied by scene_index_invalidate()
+scene_index_cache = {'valid': False, 'scene': None, 'count': 0, 'workplane': None, 'gp_objects': []}
+
+
+def scene_index(scene):
+    """returns cached workplane_TEMPORARY (or None) and names of all GP objects of the scene in their order
+    the scene is only scanned again when objects were added, removed or renamed: moving objects (every
+    workplane placement, offset or manipulator tick) keeps the cache, its entries are only checked
+    """
+    cache = scene_index_cache
+    if not scene_index_valid(scene):
+        cache['scene'] = scene.as_pointer()
+        cache['count'] = len(scene.objects)
+        cache['workplane'] = scene.objects.get('workplane_TEMPORARY')
+        cache['gp_objects'] = [gp.name for gp in scene.objects if gp.type == 'GPENCIL']
+        cache['valid'] = True
+    return cache
+
+
+def scene_index_valid(scene):
+    """returns True if the cache of scene_index() still holds the objects of scene (cheap checks only)
+    """
+    cache = scene_index_cache
+    if not cache['valid'] or cache['scene'] != scene.as_pointer() or cache['count'] != len(scene.objects):
+        return False
+    wp = cache['workplane']
+    if wp is not None and (not object_valid(wp) or wp.name != 'workplane_TEMPORARY'):
+        return False
+    # a renamed GP object
+    return all(name in scene.objects for name in cache['gp_objects'])
+
+
+@persistent
+def scene_index_invalidate(scene, *args):
+    """handler (depsgraph update, undo, file load): cached objects of scene_index() have to be looked up again
+    object updates do not invalidate: scene_index() checks the number of objects and the cached entries
+    """
+    depsgraph = args[0] if args else None
+    if (not isinstance(depsgraph, bpy.types.Depsgraph)
+            or any(depsgraph.id_type_updated(id_type) for id_type in ('COLLECTION', 'SCENE'))):
+        scene_index_cache['valid'] = False
+        scene_index_cache['workplane'] = None
+
+
+def reproject_strokes(strokes, matrix, origin, normal, direction=None, view_origin=None):
+    """moves all points of the strokes onto the plane through origin with normal (world space) at once
+    orthogonally, along direction or along the lines of sight from view_origin (perspective view)
+    matrix: matrix_world of the GP object, returns number of moved points
+    """
+    counts = np.fromiter((len(stroke.points) for stroke in strokes), dtype=np.int64, count=len(strokes))
+    offsets = np.concatenate(((0,), np.cumsum(counts)))
+    co = np.empty((offsets[-1], 3), dtype=np.float32)
+    for stroke, start, end in zip(strokes, offsets[:-1], offsets[1:]):
+        stroke.points.foreach_get('co', co[start:end].ravel())
+
+    matrix = np.array(matrix)
+    world = co @ matrix[:3, :3].T + matrix[:3, 3]
+    if view_origin is not None:
+        direction = world - np.array(view_origin)
+    projected = geometry.project_to_plane(world, origin, normal, direction)
+    co[:] = (projected - matrix[:3, 3]) @ np.linalg.inv(matrix[:3, :3]).T
+
+    for stroke, start, end in zip(strokes, offsets[:-1], offsets[1:]):
+        stroke.points.foreach_set('co', co[start:end].ravel())
+    return int(offsets[-1])
+
+
+def remove_objects(objects):
+    """removes objects at once without operators, their data is removed too unless used elsewhere
+    """
+    data = [obj.data for obj in objects if obj.data is not None]
+    bpy.data.batch_remove(ids=objects)
+    # no depsgraph update runs before the next scene_index() of the same operator
+    scene_index_invalidate(bpy.context.scene)
+    # purge data that became orphan by removing the objects
+    orphans = [d for d in set(data) if d.users == 0]
+    if orphans:
+        bpy.data.batch_remove(ids=orphans)
+
+
+def restore_workplane(index):
+    """moves the workplane to the entry of the workplane history at index
+    only the transform is set, the grid is rebuilt only if the stored count differs from the current one
+    """
+    scene = bpy.context.scene
+    entry = history.entry(scene, index)
+    wp = workplane()
+    if tuple(scene.drawchitecture.grid_count[:2]) != entry['grid_count']:
+        scene.drawchitecture.grid_count = entry['grid_count'] + (0,)
+    scene.drawchitecture.plane_location = entry['location']
+    wp.rotation_euler = entry['rotation']
+    # moves the plane to plane_location (update_offset)
+    scene.drawchitecture.plane_offset = 0.0
+    wp.location = entry['location']
+    wp.scale = entry['scale']
+    history.set_position(scene, index)
+
+
+def save_active_gp():
+    """save active gp obj in global variable
+    """
+    gp_obj = bpy.context.view_layer.objects.active
+    if gp_obj is not None and gp_obj.type == 'GPENCIL':
+        bpy.context.scene.drawchitecture.gp_active_object = gp_obj
+    else:
+        bpy.context.scene.drawchitecture.gp_active_object = None
+
+
+def save_grid_settings():
+    """Stores Grid settings of workplane to global Property of scene
+    """
+    # grid count is stored in the scene already, the mesh is built from it
+    bpy.context.scene.drawchitecture.grid_scale = bpy.data.objects['workplane_TEMPORARY'].scale
+
+
+@persistent
+def settings_migrate(*args):
+    """handler (file load): moves the scene properties of files saved before scene.drawchitecture into it
+    """
+    for scene in bpy.data.scenes:
+        for name in DrawchitectureSettings.__annotations__:
+            if name in scene.keys():
+                value = scene[name]
+                try:
+                    setattr(scene.drawchitecture, name, value.to_list() if hasattr(value, 'to_list') else value)
+                except (TypeError, ValueError):
+                    print('settings_migrate: %s of scene %s not moved' % (name, scene.name))
+                del scene[name]
+
+
+def simplify_strokes(gp_objects, epsilon):
+    """removes points of all strokes (every layer + frame) of the GP objects that are less than epsilon away
+    from the simplified line (geometry.simplify_mask), all points of a frame are read + tested at once
+    surviving points keep all their attributes (pressure, strength, uv, select), strokes keep their order
+    GP data shared by several objects is simplified once
+    returns number of points before, after and bytes of point data before, after
+    """
+    before = after = bytes_before = bytes_after = 0
+    for gp_data in {gp_obj.data.as_pointer(): gp_obj.data for gp_obj in gp_objects}.values():
+        for layer in gp_data.layers:
+            for frame in layer.frames:
+                strokes = list(frame.strokes)
+                if not strokes:
+                    continue
+                lengths = np.array([len(stroke.points) for stroke in strokes], dtype=np.int64)
+                offsets = np.concatenate(([0], np.cumsum(lengths)))
+                filled = [stroke for stroke in strokes if len(stroke.points)]
+                rna = filled[0].points[0].bl_rna.properties if filled else ()
+                # all writable point attributes, read stroke by stroke into one buffer per attribute
+                attributes = {}
+                for prop in rna:
+                    if prop.is_readonly or prop.type not in ('FLOAT', 'INT', 'BOOLEAN'):
+                        continue
+                    size = prop.array_length or 1
+                    dtype = {'FLOAT': np.float32, 'INT': np.int32, 'BOOLEAN': bool}[prop.type]
+                    values = np.empty((offsets[-1], size), dtype=dtype)
+                    for stroke, start, end in zip(strokes, offsets[:-1], offsets[1:]):
+                        stroke.points.foreach_get(prop.identifier, values[start:end].ravel())
+                    attributes[prop.identifier] = values
+
+                keep = geometry.simplify_mask(attributes['co'], offsets, epsilon) if 'co' in attributes \
+                    else np.ones(offsets[-1], dtype=bool)
+                point_bytes = sum(values[0].nbytes for values in attributes.values())
+                before += len(keep)
+                after += int(keep.sum())
+                bytes_before += len(keep) * point_bytes
+                bytes_after += int(keep.sum()) * point_bytes
+                if keep.all():
+                    continue
+
+                # strokes.new() appends: all strokes of the frame are created again in their order
+                kept = np.concatenate(([0], np.cumsum(keep)))[offsets]
+                kept = kept[1:] - kept[:-1]
+                for stroke, start, end, count in zip(strokes, offsets[:-1], offsets[1:], kept):
+                    new_stroke = frame.strokes.new()
+                    for prop in stroke.bl_rna.properties:
+                        if not prop.is_readonly and prop.identifier not in ('points', 'rna_type'):
+                            setattr(new_stroke, prop.identifier, getattr(stroke, prop.identifier))
+                    new_stroke.points.add(int(count))
+                    for identifier, values in attributes.items():
+                        new_stroke.points.foreach_set(identifier, values[start:end][keep[start:end]].ravel())
+                for stroke in strokes:
+                    frame.strokes.remove(stroke)
+        gp_obj.data.update_tag()
+    return before, after, bytes_before, bytes_after
+
+
+def workplane():
+    """returns workplane_TEMPORARY, creates it only if it does not exist yet or is not linked to the scene
+    """
+    wp = bpy.data.objects.get('workplane_TEMPORARY')
+    if wp is None:
+        settings = bpy.context.scene.drawchitecture
+        mesh = grid_mesh('workplane_TEMPORARY', settings.grid_count, settings.grid_edge_only)
+        wp = bpy.data.objects.new('workplane_TEMPORARY', mesh)
+        # scale of the last workplane
+        wp.scale = bpy.context.scene.drawchitecture.grid_scale
+        # set material of plane
+        # mat = bpy.data.materials['Mat_Transparent_White']
+        # wp.active_material = mat
+        wp.show_wire = True
+    elif wp.modifiers or not wp.data.get('drawchitecture_grid'):
+        # workplane of a file saved before grid_mesh(): plane with 4 array modifiers
+        add_grid(wp)
+    if wp.name not in bpy.context.scene.objects:
+        bpy.context.scene.collection.objects.link(wp)
+        scene_index_invalidate(bpy.context.scene)
+    return wp
+
+
+class SetupDrawchitecture(bpy.types.Operator):  # standard plane
+    """initializes the setup: colors & viewsettings
+    """
+    bl_idname = 'dt.setup'
+    bl_label = 'SetupDrawchitecture View'
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        # Viewport shader mode set to 'WIREFRAME' for transparent objects
+        find_3dview_space().shading.type = 'WIREFRAME'
+        find_3dview_space().shading.show_xray_wireframe = True
+
+        # Disable Floor Grid + Cursor in active View3D, make Vertices in editmode visible
+        find_3dview_space().overlay.show_floor = False
+        find_3dview_space().overlay.show_cursor = False
+        find_3dview_space().overlay.show_object_origins = False
+        find_3dview_space().overlay.vertex_opacity = 1
+
+        # Set 3d View Background color to white and Wire color to grey
+        bpy.context.preferences.themes[0].view_3d.space.gradients.high_gradient = (0.8, 0.8, 0.8)
+        bpy.context.preferences.themes[0].view_3d.wire = (0.5, 0.5, 0.5)
+
+        # Set Stroke Placement in active Scene to 'Surface'
+        bpy.context.window.scene.tool_settings.gpencil_stroke_placement_view3d = 'SURFACE'
+
+        # plane_array(Vector((0, 0.5, 0)), Vector((1, 0.5, 0)), 'h')  # default workplane at 0,0,0
+
+        # create GP object or activate last GP object
+        activate_gp()
+        # switch to DRAW mode
+        gpencil_paint_mode()
+
+        return {'FINISHED'}
+
+
+class ExportStrokes(bpy.types.Operator, ExportHelper):
+    """Exports the strokes of all GP objects as stroke archive (folder of raw point buffers + offsets)
+    """
+    bl_idname = 'dt.export_strokes'
+    bl_label = 'export strokes'
+    filename_ext = '.dtstrokes'
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        points = export_strokes(self.filepath)
+        self.report({'INFO'}, 'exported %d points to %s' % (points, self.filepath))
+        return {'FINISHED'}
+
+
+class ImportStrokes(bpy.types.Operator, ImportHelper):
+    """Imports a stroke archive as new GP objects: select header.json inside the .dtstrokes folder
+    """
+    bl_idname = 'dt.import_strokes'
+    bl_label = 'import strokes'
+    bl_options = {'REGISTER', 'UNDO'}
+    filter_glob: bpy.props.StringProperty(default='header.json', options={'HIDDEN'})
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        try:
+            gp_objects = import_strokes(self.filepath)
+        except (OSError, ValueError) as error:
+            self.report({'ERROR'}, 'import strokes: ' + str(error))
+            return {'CANCELLED'}
+        self.report({'INFO'}, 'imported %d GP objects' % len(gp_objects))
+        gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class InitializeDrawchitecture(bpy.types.Operator):  # standard plane
+    """initializes the setup: default workplane at start, activates GP mode
+    """
+    bl_idname = 'dt.initialize'
+    bl_label = 'Create Baseplane (+ GP Object if there is none)'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        # default workplane at 0,0,0
+        plane_array(Vector((0, 0.5, 0)), Vector((1, 0.5, 0)), 'bp')
+
+        # create GP object if there is none
+        # if not [obj for obj in bpy.data.objects if obj.type == 'GPENCIL']:
+        # add_GP()
+        activate_gp()
+        # switch to DRAW mode
+        gpencil_paint_mode()
+
+        return {'FINISHED'}
+
+
+class AddGPObject(bpy.types.Operator):
+    """Adds new GP Object to Scene, locked at 0.0.0
+    """
+    bl_idname = 'dt.add_gp_object'
+    bl_label = 'adds gp object, locked at 0.0.0'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        add_GP()
+        gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class AddRotation(bpy.types.Operator):
+    """Adds given rotation to the rotation vector of workplane_TEMPORARY, property sets +/- and Achsis
+    only shown when workplane_Temporary exists
+    """
+    bl_idname = 'dt.add_rotation'
+    bl_label = 'add rotation'
+    bl_options = {'REGISTER', 'UNDO'}
+    axis: bpy.props.StringProperty()
+    rotation: bpy.props.FloatProperty()
+
+    # axis_index = bpy.props.IntProperty()
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        wp = bpy.data.objects['workplane_TEMPORARY']
+        rotation_old = wp.rotation_euler
+        rotation_add = self.rotation * math.pi / 180
+
+        if self.axis == 'x':
+            axis_index = 0
+        elif self.axis == 'y':
+            axis_index = 1
+        elif self.axis == 'z':
+            axis_index = 2
+        else:
+            print('error: axis must be x / y / z')
+            return {'CANCELLED'}
+
+        bpy.data.objects['workplane_TEMPORARY'].rotation_euler[axis_index] = rotation_old[axis_index] + rotation_add
+        return {'FINISHED'}
+
+
+class AnalyzeStrokes(bpy.types.Operator):
+    """Analyzes the strokes in the background, drawing goes on while it runs
+    the points are copied at the start, the result is shown in the Analysis box (fit: workplane is added)
+    """
+    bl_idname = 'dt.analyze_strokes'
+    bl_label = 'analyze strokes in the background'
+    task: bpy.props.EnumProperty(items=(('STATS', 'statistics', 'number + length of strokes, bounding box'),
+                                        ('FIT', 'fit workplane', 'workplane fitted through all points'),
+                                        ('SIMPLIFY', 'simplify preview', 'points simplify strokes would keep')),
+                                 default='STATS')
+    scope: bpy.props.EnumProperty(items=(('ACTIVE', 'active GP object', 'strokes of the active GP object'),
+                                         ('SCENE', 'scene', 'strokes of all visible GP objects of the scene')),
+                                  default='SCENE')
+    epsilon: bpy.props.FloatProperty(name='tolerance', default=0.005, min=0.0, soft_max=0.1, precision=4,
+                                     subtype='DISTANCE', unit='LENGTH',
+                                     description='simplify preview: max. distance of a removed point')
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        if self.scope == 'SCENE':
+            gp_objects = [obj for obj in context.scene.objects if obj.type == 'GPENCIL' and obj.visible_get()]
+        else:
+            gp_obj = context.scene.drawchitecture.gp_active_object
+            gp_objects = [gp_obj] if gp_obj is not None else []
+        frames = analysis.snapshot(gp_objects)
+        if not frames:
+            self.report({'INFO'}, 'analysis: no strokes')
+            return {'CANCELLED'}
+
+        if self.task == 'FIT':
+            jobs.submit('fit', analysis.fit, (frames,), len(frames) + 1, analysis_fit_apply)
+        elif self.task == 'SIMPLIFY':
+            jobs.submit('simplify preview', analysis.simplify_preview, (frames, self.epsilon), len(frames),
+                        analysis_simplify_apply)
+        else:
+            jobs.submit('statistics', analysis.stats, (frames,), len(frames), analysis_stats_apply)
+        return {'FINISHED'}
+
+
+class CancelJobs(bpy.types.Operator):
+    """Cancels the running analysis jobs, their results are dropped
+    """
+    bl_idname = 'dt.cancel_jobs'
+    bl_label = 'cancel analysis'
+
+    def execute(self, context):
+        jobs.cancel()
+        return {'FINISHED'}
+
+
+class ClearPlaneAndGP(bpy.types.Operator):
+    """ Deletes the Temporary Workplane and all GP Objects
+    """
+    bl_idname = 'dt.clear_all_objects'
+    bl_label = 'clears all Temporary Workplane + gp objects in project'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        if not bpy.context.mode == 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+        # delete all objects
+        if bpy.data.objects:
+            # the saved GP would keep its object alive
+            bpy.context.scene.drawchitecture.gp_active_object = None
+            objects = [o for o in bpy.data.objects if o.type == 'GPENCIL']
+            if 'workplane_TEMPORARY' in bpy.data.objects:
+                # keep scale for the next workplane
+                save_grid_settings()
+                objects.append(bpy.data.objects['workplane_TEMPORARY'])
+            remove_objects(objects)
+
+            if bpy.data.grease_pencil:
+                bpy.data.batch_remove(ids=list(bpy.data.grease_pencil))
+            gpencil_obj_name_reset()
+            bpy.context.scene.drawchitecture.plane_offset = 0.0
+            bpy.ops.dt.initialize()
+            return {'FINISHED'}
+        else:
+            bpy.context.scene.drawchitecture.gp_active_object = None
+            bpy.ops.dt.initialize()
+            return {'FINISHED'}
+
+
+class DeleteLastStroke(bpy.types.Operator):
+    """For V/H/3D: deletes last drawn stroke of active GP Object
+    """
+    bl_idname = 'dt.delete_last_stroke'
+    bl_label = 'deletes last stroke of active GP object'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        save_active_gp()
+        activate_gp()
+
+        gp_pen = bpy.context.scene.drawchitecture.gp_active_object.data
+        if gp_pen.layers.active:
+            strokes = gp_pen.layers.active.active_frame.strokes
+            if strokes:
+                # removed directly from the frame, no Editmode + selection needed
+                strokes.remove(strokes[-1])
+                gp_pen.update_tag()
+            else:
+                print('DeleteLastStroke: Active Grease Pencil has no strokes to be deleted')
+        else:
+            print('DeleteLastStroke: Active Grease Pencil has no strokes to be deleted')
+
+        gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class ReprojectStrokes(bpy.types.Operator):
+    """Moves strokes onto the workplane, orthogonally or along the view
+    """
+    bl_idname = 'dt.reproject_strokes'
+    bl_label = 'reproject strokes onto workplane'
+    bl_options = {'REGISTER', 'UNDO'}
+    scope: bpy.props.EnumProperty(items=(('SELECTED', 'selected strokes', 'selected strokes of the active GP object'),
+                                         ('LAYER', 'active layer', 'strokes of the active layer'),
+                                         ('OBJECT', 'all layers', 'strokes of all layers of the active GP object')),
+                                  default='LAYER')
+    method: bpy.props.EnumProperty(items=(('ORTHO', 'orthogonal', 'along the normal of the workplane'),
+                                          ('VIEW', 'view', 'along the view direction of the 3D view')),
+                                   default='ORTHO')
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        wp = scene_index(context.scene)['workplane']
+        if wp is None:
+            self.report({'WARNING'}, 'reproject: no workplane')
+            return {'CANCELLED'}
+        save_active_gp()
+        activate_gp()
+        gp_obj = context.scene.drawchitecture.gp_active_object
+        if self.scope == 'LAYER':
+            layers = [gp_obj.data.layers.active] if gp_obj.data.layers.active else []
+        else:
+            layers = list(gp_obj.data.layers)
+        # locked layers are not changed
+        strokes = [stroke for layer in layers if not layer.lock and layer.active_frame is not None
+                   for stroke in layer.active_frame.strokes if self.scope != 'SELECTED' or stroke.select]
+
+        direction = view_origin = None
+        if self.method == 'VIEW':
+            # the view the operator was run from, any 3D view if run from elsewhere (menu search, script)
+            if context.area is not None and context.area.type == 'VIEW_3D':
+                region_3d = context.region_data or context.space_data.region_3d
+            else:
+                region_3d = getattr(find_3dview_space(), 'region_3d', None)
+            if region_3d is None:
+                self.report({'WARNING'}, 'reproject: no 3D view')
+                return {'CANCELLED'}
+            if region_3d.is_perspective:
+                view_origin = region_3d.view_matrix.inverted().translation
+            else:
+                direction = region_3d.view_rotation @ Vector((0, 0, -1))
+        normal = wp.matrix_world.to_3x3() @ Vector((0, 0, 1))
+        points = reproject_strokes(strokes, gp_obj.matrix_world, wp.matrix_world.translation, normal,
+                                   direction, view_origin)
+        gp_obj.data.update_tag()
+        self.report({'INFO'}, 'reprojected %d strokes, %d points' % (len(strokes), points))
+        if self.scope != 'SELECTED':
+            gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class RemoveGPObject(bpy.types.Operator):
+    """Removes the active GP Object
+    """
+    bl_idname = 'dt.remove_gp_object'
+    bl_label = 'removes active GP Object'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        # activate last gp or write gp name in global variable
+        activate_gp()
+
+        # object mode must be activated to delete an object
+        if not bpy.context.mode == 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        gp_obj = bpy.context.scene.drawchitecture.gp_active_object
+        # if the saved GP is part of the scene, delete it
+        if gp_obj is not None and gp_obj.name in bpy.context.view_layer.objects:
+            # clear saved GP to activate any other GP or create new if no GP left
+            bpy.context.scene.drawchitecture.gp_active_object = None
+            gpencil_obj_name_release(gp_obj.name)
+            remove_objects([gp_obj])
+
+        activate_gp()
+        gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class ManipulateWorkplane(bpy.types.Operator):
+    """Drag the workplane in the viewport: move mouse left / right
+    G: offset in normal direction, R: rotation (X / Y / Z: local axis), S: scale, SHIFT: fine steps
+    LMB / ENTER: confirm, RMB / ESC: cancel
+    """
+    bl_idname = 'dt.manipulate_workplane'
+    bl_label = 'drag workplane offset / rotation / scale'
+    bl_options = {'REGISTER', 'UNDO'}
+    # updates per second, mouse moves in between are collected
+    rate: bpy.props.FloatProperty(default=60.0, min=1.0, max=240.0)
+
+    def invoke(self, context, event):
+        self.wp = scene_index(context.scene)['workplane']
+        if self.wp is None or context.area is None or context.area.type != 'VIEW_3D':
+            self.report({'WARNING'}, 'drag workplane: needs workplane and 3D View')
+            return {'CANCELLED'}
+        # state for cancel
+        self.original = (self.wp.location.copy(), self.wp.rotation_euler.copy(), self.wp.scale.copy(),
+                         context.scene.drawchitecture.plane_offset)
+        self.offset_start = context.scene.drawchitecture.plane_offset
+        self.mode = 'OFFSET'
+        self.axis = 2
+        self.rebase()
+        self.timer = context.window_manager.event_timer_add(1 / self.rate, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        self.header(context)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'MOUSEMOVE':
+            step = 0.1 if event.shift else 1.0
+            self.delta = self.delta + (event.mouse_x - event.mouse_prev_x) * step
+            self.pending = True
+        elif event.type == 'TIMER':
+            # coalesced: at most one update of the workplane per timer tick
+            if self.pending:
+                self.apply(context)
+                self.pending = False
+        elif event.type in {'G', 'R', 'S'} and event.value == 'PRESS':
+            # keeps the change of the last mode
+            self.apply(context)
+            if self.mode == 'OFFSET':
+                self.offset_start = self.offset_start + self.delta * 0.01
+            self.rebase()
+            self.mode = {'G': 'OFFSET', 'R': 'ROTATION', 'S': 'SCALE'}[event.type]
+            self.header(context)
+        elif event.type in {'X', 'Y', 'Z'} and event.value == 'PRESS' and self.mode == 'ROTATION':
+            self.apply(context)
+            self.rebase()
+            self.axis = 'XYZ'.index(event.type)
+            self.header(context)
+        elif event.type in {'LEFTMOUSE', 'RET', 'NUMPAD_ENTER'} and event.value == 'PRESS':
+            self.apply(context)
+            self.finish(context)
+            if self.mode == 'OFFSET':
+                self.offset_start = self.offset_start + self.delta * 0.01
+            self.rebase()
+            # UI value, update_offset puts the plane where it is now
+            context.scene.drawchitecture.plane_location = self.location_start
+            context.scene.drawchitecture.plane_offset = self.offset_start
+            return {'FINISHED'}
+        elif event.type in {'RIGHTMOUSE', 'ESC'} and event.value == 'PRESS':
+            self.restore()
+            self.finish(context)
+            return {'CANCELLED'}
+        return {'RUNNING_MODAL'}
+
+    def apply(self, context):
+        """sets the workplane from the collected mouse movement, using the basis precomputed at start
+        """
+        if self.mode == 'OFFSET':
+            offset = self.offset_start + self.delta * 0.01
+            self.wp.location = self.location_start + self.normal * offset
+        elif self.mode == 'ROTATION':
+            angle = math.radians(self.delta * 0.5)
+            rotation = self.matrix_start @ Matrix.Rotation(angle, 3, 'XYZ'[self.axis])
+            self.wp.rotation_euler = rotation.to_euler('XYZ', self.rotation_start)
+        elif self.mode == 'SCALE':
+            factor = math.exp(self.delta * 0.005)
+            self.wp.scale = (self.scale_start[0] * factor, self.scale_start[1] * factor, self.scale_start[2])
+        self.header(context)
+
+    def finish(self, context):
+        context.window_manager.event_timer_remove(self.timer)
+        context.area.header_text_set(None)
+
+    def header(self, context):
+        if self.mode == 'OFFSET':
+            text = 'offset %.3f m' % (self.offset_start + self.delta * 0.01)
+        elif self.mode == 'ROTATION':
+            text = 'rotation %.1f° around local %s' % (self.delta * 0.5, 'XYZ'[self.axis])
+        else:
+            text = 'scale x %.3f' % math.exp(self.delta * 0.005)
+        context.area.header_text_set('Workplane: ' + text + '  |  G offset, R rotation (X/Y/Z), S scale, '
+                                                            'SHIFT fine, LMB confirm, RMB cancel')
+
+    def rebase(self):
+        """current state of the workplane as start for the next movements, precomputes its basis
+        """
+        self.rotation_start = self.wp.rotation_euler.copy()
+        self.scale_start = self.wp.scale.copy()
+        self.matrix_start = self.rotation_start.to_matrix()
+        self.normal = self.matrix_start.col[2].copy()
+        # location without offset, the plane moves along its normal
+        self.location_start = self.wp.location - self.normal * self.offset_start
+        self.delta = 0.0
+        self.pending = False
+
+    def restore(self):
+        """workplane back to the state at invoke
+        """
+        self.wp.location, self.wp.rotation_euler, self.wp.scale = self.original[:3]
+
+
+class PinWorkplane(bpy.types.Operator):
+    """Adds the current workplane (with its rotation, offset and scale) as pinned plane to the workplane history
+    """
+    bl_idname = 'dt.pin_workplane'
+    bl_label = 'pin workplane'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        wp = scene_index(context.scene)['workplane']
+        if wp is None:
+            return {'CANCELLED'}
+        history.push(context.scene, wp, pinned=True)
+        return {'FINISHED'}
+
+
+class ResetDiagnostics(bpy.types.Operator):
+    """Clears the operator timings of the Diagnostics box
+    """
+    bl_idname = 'dt.reset_diagnostics'
+    bl_label = 'clears operator timings'
+
+    def execute(self, context):
+        diagnostics.records.clear()
+        return {'FINISHED'}
+
+
+class ResetScale(bpy.types.Operator):
+    """Reset X and Y scale + count of workplane
+    """
+    bl_idname = 'dt.reset_scale'
+    bl_label = 'reset scale + count'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        scale_default = (1.0, 1.0, 0)
+
+        wp = bpy.data.objects['workplane_TEMPORARY']
+
+        wp.scale = scale_default
+        # rebuilds the grid mesh
+        bpy.context.scene.drawchitecture.grid_count = (100, 100, 0)
+
+        save_grid_settings()
+        return {'FINISHED'}
+
+
+class RestoreWorkplane(bpy.types.Operator):
+    """Restores previous (step -1) or next (step 1) workplane of the workplane history
+    """
+    bl_idname = 'dt.restore_workplane'
+    bl_label = 'previous / next workplane'
+    bl_options = {'REGISTER', 'UNDO'}
+    step: bpy.props.IntProperty(default=-1)
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        index = history.step(context.scene, self.step, context.scene.drawchitecture.history_pinned_only)
+        if index is None:
+            self.report({'INFO'}, 'no more workplanes in history')
+            return {'CANCELLED'}
+        restore_workplane(index)
+        return {'FINISHED'}
+
+
+class SelectGPobject(bpy.types.Operator):
+    """Shows buttons with all GP Objects and selects them
+    (Problems with hidden GP Objects)
+    """
+    bl_idname = 'dt.select_gp_object'
+    bl_label = 'Activates Greasepencil Object by Name on Button'
+    bl_options = {'REGISTER', 'UNDO'}
+    gp: bpy.props.StringProperty(default='', options={'SKIP_SAVE'})
+
+    @classmethod
+    def poll(cls, context):
+        return context.active_object is not None
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        deselect_all()
+        gp = context.scene.objects.get(self.gp)
+        bpy.context.view_layer.objects.active = gp
+        context.scene.grease_pencil = gp.grease_pencil
+        save_active_gp()
+        gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class SimplifyStrokes(bpy.types.Operator):
+    """Removes nearly collinear points of all strokes (Ramer-Douglas-Peucker), pressure + strength are kept
+    """
+    bl_idname = 'dt.simplify_strokes'
+    bl_label = 'simplify strokes'
+    bl_options = {'REGISTER', 'UNDO'}
+    epsilon: bpy.props.FloatProperty(name='tolerance', default=0.005, min=0.0, soft_max=0.1, precision=4,
+                                     subtype='DISTANCE', unit='LENGTH',
+                                     description='max. distance of a removed point to the simplified stroke')
+    scope: bpy.props.EnumProperty(items=(('ACTIVE', 'active GP object', 'strokes of the active GP object'),
+                                         ('SCENE', 'scene', 'strokes of all GP objects of the scene')),
+                                  default='ACTIVE')
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        mode = context.mode
+        if self.scope == 'SCENE':
+            gp_objects = [obj for obj in context.scene.objects if obj.type == 'GPENCIL']
+        else:
+            save_active_gp()
+            activate_gp()
+            gp_objects = [context.scene.drawchitecture.gp_active_object]
+        # strokes can only be replaced outside of Draw/Editmode
+        if mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+        before, after, bytes_before, bytes_after = simplify_strokes(gp_objects, self.epsilon)
+        # back to the mode the operator was started in (context.mode: EDIT_GPENCIL, PAINT_GPENCIL, ...)
+        if mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode=mode)
+        self.report({'INFO'}, 'simplified %d to %d points (-%d%%), %.1f kB less point data'
+                    % (before, after, 100 * (before - after) // max(before, 1), (bytes_before - bytes_after) / 1024))
+        return {'FINISHED'}
+
+
+class SnapWorkplane(bpy.types.Operator):
+    """Adds workplane through the stroke points closest to the 3D cursor (all visible GP objects)
+    1 point: horizontal plane, 2 points: 3D plane, 3 or more: fitted plane
+    """
+    bl_idname = 'dt.snap_workplane'
+    bl_label = 'snap workplane to stroke points at 3D cursor'
+    bl_options = {'REGISTER', 'UNDO'}
+    count: bpy.props.IntProperty(default=3, min=1)
+    radius: bpy.props.FloatProperty(default=0.0, min=0.0)
+    rebuild: bpy.props.BoolProperty(default=False, options={'SKIP_SAVE'})
+    crossings: bpy.props.BoolProperty(default=False)
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        snapping.update(context.scene, self.rebuild)
+        center = context.scene.cursor.location
+        if self.radius > 0:
+            points, distances = snapping.radius(center, self.radius)
+        else:
+            points, distances = snapping.nearest(center, self.count)
+
+        wp = bpy.data.objects.get('workplane_TEMPORARY')
+        if self.crossings and wp is not None:
+            # crossings of the strokes with the current workplane compete with the stroke points
+            intersections.update(context.scene)
+            hits = intersections.crossings(wp)
+            if len(hits):
+                hit_distances = np.linalg.norm(hits - np.array(center), axis=1)
+                points = np.concatenate((points, hits))
+                distances = np.concatenate((distances, hit_distances))
+                if self.radius > 0:
+                    keep = np.flatnonzero(distances <= self.radius)
+                else:
+                    keep = np.argsort(distances, kind='stable')[:self.count]
+                points, distances = points[keep], distances[keep]
+
+        if len(points) == 0:
+            self.report({'INFO'}, 'snap: no stroke points found')
+            return {'CANCELLED'}
+        elif len(points) == 1:
+            plane_array(points[0], (0, 0, 0), '1p')
+        else:
+            centroid, normal, rms, planarity = geometry.fit_plane(points)
+            if len(points) == 2 or planarity == 0:
+                # points on a line: tilted plane through the 2 points farthest apart along the line
+                direction = points[-1] - points[0]
+                order = np.argsort(points @ direction)
+                plane_array(points[order[0]], points[order[-1]], '3d')
+            else:
+                plane_array(centroid, centroid + normal, '3p')
+        gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class SwitchScaleAndCount(bpy.types.Operator):
+    """Switches X and Y scale + count of workplane
+    """
+    bl_idname = 'dt.switch_scale_and_count'
+    bl_label = 'switch x/y'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        scale = bpy.data.objects['workplane_TEMPORARY'].scale
+        scale_switched = (scale[1], scale[0], scale[2])
+
+        wp = bpy.data.objects['workplane_TEMPORARY']
+
+        wp.scale = scale_switched
+
+        # rebuilds the grid mesh
+        count = bpy.context.scene.drawchitecture.grid_count
+        bpy.context.scene.drawchitecture.grid_count = (count[1], count[0], 0)
+
+        save_grid_settings()
+        return {'FINISHED'}
+
+
+class WPstrokeV(bpy.types.Operator):  # First+ Last Point of last Stroke create vertical plane
+    """adds VERTICAL workplane at last grease pencil stroke by start + endpoint of stroke
+    ! GP Object must be selected first
+    ! GP Object and Grease_Pencil object need equal Names
+    """
+    bl_idname = 'dt.work_plane_on_stroke_2p'
+    bl_label = 'add vertical workplane by stroke start end'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        # last greasepencil stroke
+        # gp_laststroke = bpy.data.grease_pencil[-1].layers.active.active_frame.strokes[-1]
+        endpoints = laststroke_endpoints()
+        if endpoints is None:
+            return {'CANCELLED'}
+        else:
+            plane_array(endpoints[0], endpoints[1], "v")
+            # DELETE LAST GP STROKE
+            # if not bpy.context.mode == 'EDIT':
+            #    bpy.ops.object.mode_set(mode='EDIT')
+            # gp_laststroke
+            # bpy.ops.gpencil.delete(type='STROKES')
+            gpencil_paint_mode()
+            return {'FINISHED'}
+
+
+class WPStrokeH(bpy.types.Operator):  # First+ Last Point of last Stroke create horizontal plane
+    """adds HORIZONTAL workplane at last grease pencil stroke by start + endpoint of stroke
+    ! GP Object must be selected first
+    ! GP Object and Grease_Pencil object need equal Names
+    """
+    bl_idname = 'dt.work_plane_on_stroke_2p_horizontal'
+    bl_label = 'add horizontal workplane by stroke start end'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        # last greasepencil stroke
+        # gp_laststroke = bpy.data.grease_pencil[-1].layers.active.active_frame.strokes[-1]
+        endpoints = laststroke_endpoints()
+        if endpoints is None:
+            return {'CANCELLED'}
+        else:
+            plane_array(endpoints[0], endpoints[1], "h")
+            gpencil_paint_mode()
+            return {'FINISHED'}
+
+
+class WPstroke3D(bpy.types.Operator):  # First+ Last Point of last Stroke create horizontal plane
+    """adds tilted Plane to any Stroke by Start + Endpoint of Stroke
+    ! GP Object must be selected first -
+    ! GP Object and Grease_Pencil object need equal Names
+    """
+    bl_idname = 'dt.work_plane_on_stroke_2p_3d'
+    bl_label = 'align workplane to tilted 3d-strokes by start end'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        endpoints = laststroke_endpoints()
+        if endpoints is None:
+            return {'CANCELLED'}
+        else:
+            plane_array(endpoints[0], endpoints[1], '3d')
+            gpencil_paint_mode()
+            return {'FINISHED'}
+
+
+class WPselect3P(bpy.types.Operator):  # Plane from 1/2/3 Points in Selection
+    """First click: enter Stroke-Edit mode, select up to 3 points (hold SHIFT)
+    Second Click: create Plane through Points
+    1point: horizontal plane
+    2points: 3D Plane through 2 Points
+    3points: 3D Plane through 3 Points
+    """
+    bl_idname = 'dt.work_plane_points_3d'
+    bl_label = 'Enters Editmode, or converts up to 3 Selected GP_Points to a Plane'
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        # save gp here?
+        save_active_gp()
+        activate_gp()
+        if not bpy.context.mode == 'EDIT_GPENCIL':
+            bpy.ops.object.mode_set(mode='EDIT_GPENCIL')
+            bpy.context.scene.tool_settings.gpencil_selectmode = 'POINT'
+        else:
+            # prevent this mode from deleting last stroke
+            if bpy.context.scene.drawchitecture.del_stroke:
+                bpy.context.scene.drawchitecture.del_stroke = False
+                add_workplane_3p()
+                bpy.context.scene.drawchitecture.del_stroke = True
+            else:
+                add_workplane_3p()
+
+            # reactivate gp here
+            gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class WPfit(bpy.types.Operator):  # best-fit Plane through all Points of last Stroke or Selection
+    """adds workplane fitted through all points of the last stroke (or the selected points in Editmode)
+    warns if the points are not in one plane
+    """
+    bl_idname = 'dt.work_plane_fit'
+    bl_label = 'fit workplane through all points of last stroke or selection'
+    bl_options = {'REGISTER', 'UNDO'}
+    source: bpy.props.EnumProperty(items=(('STROKE', 'last stroke', 'all points of the last stroke'),
+                                          ('SELECTION', 'selection', 'selected points of the active GP object')),
+                                   default='STROKE')
+
+    @diagnostics.instrumented
+    def execute(self, context):
+        if self.source == 'SELECTION':
+            save_active_gp()
+            activate_gp()
+            gp_pen = bpy.context.scene.drawchitecture.gp_active_object.data
+            if not gp_pen.layers.active or not gp_pen.layers.active.active_frame.strokes:
+                return {'CANCELLED'}
+            co, select = frame_points(gp_pen.layers.active.active_frame)
+            points = co[select]
+            centroid, normal, rms, planarity = geometry.fit_plane(points)
+            count = len(points)
+        else:
+            ls = laststroke()
+            if ls == {'GP obj inactive'}:
+                return {'CANCELLED'}
+            elif ls == {'No Strokes'}:
+                return {'CANCELLED'}
+            # fitted once per stroke (strokecache)
+            meta = strokecache.last_stroke(bpy.context.view_layer.objects.active)
+            centroid, normal, rms, planarity = meta['centroid'], meta['normal'], meta['rms'], meta['planarity']
+            count = meta['count']
+
+        if count < 3 or planarity == 0:
+            self.report({'WARNING'}, 'fit: needs at least 3 points that are not on a line')
+            return {'CANCELLED'}
+        bpy.context.scene.drawchitecture.fit_residual = rms
+        bpy.context.scene.drawchitecture.fit_planarity = planarity
+
+        # plane through centroid, defined by its normal like a 3 point plane
+        plane_array(centroid, centroid + normal, '3p')
+        if self.source == 'STROKE' and bpy.context.scene.drawchitecture.del_stroke:
+            bpy.ops.dt.delete_last_stroke()
+        if rms > bpy.context.scene.drawchitecture.fit_tolerance:
+            self.report({'WARNING'}, 'fit: points are not planar, rms distance %.3f m' % rms)
+        gpencil_paint_mode()
+        return {'FINISHED'}
+
+
+class View3DPanel:
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Drawchitecture'
+
+
+class AddPanel(View3DPanel, Panel):
+    """Interface
+    """
+    bl_label = 'Drawchitecture'
+
+    # bl_context = 'objectmode' # without context works for all contexts
+    # bl_category = 'Drawchitecture'
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        index = scene_index(context.scene)
+        settings = context.scene.drawchitecture
+        wp = index['workplane']
+
+        system_box = layout.box()
+        system_box_title = system_box.row(align=True)
+        system_box_title.label(text='System Tools', icon='SETTINGS')
+        system_box_title_sub = system_box_title.row()
+        system_box_title_sub.prop(settings, 'expand_system', text='', icon='THREE_DOTS', emboss=False)
+        if settings.expand_system:
+            system_box_col1 = system_box.column(align=True)
+            system_box_col1.operator('dt.setup', text='Setup View', icon='PLAY')
+            system_box_col1.operator('dt.clear_all_objects', text='Clear All Objects', icon='LIBRARY_DATA_BROKEN')
+            system_box_col1_row1 = system_box_col1.row(align=True)
+            system_box_col1_row1.operator('dt.export_strokes', text='Export Strokes', icon='EXPORT')
+            system_box_col1_row1.operator('dt.import_strokes', text='Import', icon='IMPORT')
+            system_box_col1_row2 = system_box_col1.row(align=True)
+            simplify = system_box_col1_row2.operator('dt.simplify_strokes', text='Simplify Strokes', icon='MOD_DECIM')
+            simplify.scope = 'ACTIVE'
+            simplify = system_box_col1_row2.operator('dt.simplify_strokes', text='All', icon='SCENE_DATA')
+            simplify.scope = 'SCENE'
+
+            bg_color = bpy.context.preferences.themes[0].view_3d.space.gradients
+            color_col1 = system_box.column(align=True)
+            color_col1.label(icon='COLOR', text='Colors')
+            color_col1.prop(bg_color, 'high_gradient', text='background')
+
+            wire_color = bpy.context.preferences.themes[0].view_3d
+            color_col1.prop(wire_color, 'wire', text='wire lines')
+
+        # box with Create WP options
+        workplane_box = layout.box()
+        workplane_box_title = workplane_box.row(align=True)
+        workplane_box_title.label(text='Workplanes', icon='MESH_GRID')
+        workplane_box_title.prop(settings, "del_stroke", text="delete Stroke")
+        # Buttons
+        workplane_box_row1 = workplane_box.row()
+        workplane_box_row1.operator('dt.delete_last_stroke', text='Delete Last Stroke', icon='STROKE')
+        workplane_box_col1 = workplane_box.column(align=True)
+        workplane_box_col1.operator('dt.initialize', text='horizontal base plane', icon='AXIS_TOP')
+        workplane_box_row2 = workplane_box_col1.row(align=True)
+        if settings.del_stroke:
+            workplane_box_row2.alert = True
+        workplane_box_row2.operator('dt.work_plane_on_stroke_2p', text='V', icon='AXIS_FRONT')
+        workplane_box_row2.operator('dt.work_plane_on_stroke_2p_horizontal', text='H', icon='AXIS_TOP')
+        workplane_box_row2.operator('dt.work_plane_on_stroke_2p_3d', text='3D', icon='MOD_LATTICE')
+        workplane_box_row2_auto = workplane_box_col1.row(align=True)
+        workplane_box_row2_auto.label(text='auto', icon='AUTO')
+        workplane_box_row2_auto.prop(settings, 'auto_workplane', expand=True)
+        if settings.auto_workplane != 'OFF':
+            workplane_box_row2_auto.prop(settings, 'auto_min_length', text='min')
+        workplane_box_row3 = workplane_box_col1.row(align=True)
+        if bpy.context.mode == 'EDIT_GPENCIL':
+            workplane_box_row3.alert = True
+        workplane_box_row3.operator('dt.work_plane_points_3d', text='select 1 / 2 / 3 points', icon='MOD_DATA_TRANSFER')
+        workplane_box_row4 = workplane_box_col1.row(align=True)
+        if bpy.context.mode == 'EDIT_GPENCIL':
+            fit = workplane_box_row4.operator('dt.work_plane_fit', text='fit selection', icon='MOD_SMOOTH')
+            fit.source = 'SELECTION'
+        else:
+            fit = workplane_box_row4.operator('dt.work_plane_fit', text='fit stroke', icon='MOD_SMOOTH')
+            fit.source = 'STROKE'
+        workplane_box_row4.prop(settings, 'fit_tolerance', text='tolerance')
+        workplane_box_row5 = workplane_box_col1.row(align=True)
+        snap = workplane_box_row5.operator('dt.snap_workplane', text='snap to cursor', icon='SNAP_ON')
+        snap.count = settings.snap_count
+        snap.radius = settings.snap_radius
+        snap.crossings = settings.snap_crossings
+        workplane_box_row5.prop(settings, 'snap_count', text='points')
+        workplane_box_row5.prop(settings, 'snap_radius', text='radius')
+        workplane_box_row5_crossings = workplane_box_col1.row(align=True)
+        workplane_box_row5_crossings.prop(settings, 'show_intersections', text='show crossings', icon='PARTICLE_POINT')
+        workplane_box_row5_crossings.prop(settings, 'snap_crossings', text='snap to crossings', icon='SNAP_VERTEX')
+        if settings.fit_residual > settings.fit_tolerance:
+            workplane_box.label(text='last fit not planar: rms %.3f m' % settings.fit_residual, icon='ERROR')
+        # only once strokecache is loaded by an operator
+        meta = strokecache.last_stroke(settings.gp_active_object) if loaded(strokecache) else None
+        if meta is not None and meta['count'] >= 2:
+            size = meta['bbox_max'] - meta['bbox_min']
+            workplane_box.label(text='last stroke: %d points, %.2f x %.2f x %.2f m%s'
+                                % (meta['count'], size[0], size[1], size[2],
+                                   ', planar' if meta['rms'] <= settings.fit_tolerance else ''),
+                                icon='GREASEPENCIL')
+
+        if wp:
+            workplane_rotation_box = layout.box()
+            workplane_rotation_box_title = workplane_rotation_box.row(align=True)
+            workplane_rotation_box_title.label(text='Workplane Rotation', icon='FILE_REFRESH')
+            wp_rot_box_row1 = workplane_rotation_box.row(align=True)
+            wp_rot_box_row1_sub1 = wp_rot_box_row1.row()
+
+            wp_rot_box_row1_sub1.prop(wp, 'rotation_euler', text=' ')
+
+            wp_rot_box_row1_sub2 = wp_rot_box_row1.column(align=True)
+            minus_x = wp_rot_box_row1_sub2.operator('dt.add_rotation', text='- 45°')
+            minus_x.axis = 'x'
+            minus_x.rotation = -45
+            minus_y = wp_rot_box_row1_sub2.operator('dt.add_rotation', text='- 45°')
+            minus_y.axis = 'y'
+            minus_y.rotation = -45
+            minus_z = wp_rot_box_row1_sub2.operator('dt.add_rotation', text='- 45°')
+            minus_z.axis = 'z'
+            minus_z.rotation = -45
+
+            wp_rot_box_row1_sub3 = wp_rot_box_row1.column(align=True)
+            plus_x = wp_rot_box_row1_sub3.operator('dt.add_rotation', text='+ 45°')
+            plus_x.axis = 'x'
+            plus_x.rotation = 45
+            plus_y = wp_rot_box_row1_sub3.operator('dt.add_rotation', text='+ 45°')
+            plus_y.axis = 'y'
+            plus_y.rotation = 45
+            plus_z = wp_rot_box_row1_sub3.operator('dt.add_rotation', text='+ 45°')
+            plus_z.axis = 'z'
+            plus_z.rotation = 45
+
+            wp_rot_box_row2 = workplane_rotation_box.row(align=True)
+            wp_rot_box_row2.prop(settings, 'plane_offset')
+            wp_rot_box_row2.operator('dt.manipulate_workplane', text='', icon='ORIENTATION_GIMBAL')
+
+            wp_rot_box_row3 = workplane_rotation_box.row(align=True)
+            wp_rot_box_row3.operator('dt.restore_workplane', text='', icon='TRIA_LEFT').step = -1
+            wp_rot_box_row3.label(text='plane %d / %d' % (history.position(context.scene) + 1,
+                                                          history.length(context.scene)))
+            wp_rot_box_row3.operator('dt.restore_workplane', text='', icon='TRIA_RIGHT').step = 1
+            wp_rot_box_row3.operator('dt.pin_workplane', text='', icon='PINNED')
+            wp_rot_box_row3.prop(settings, 'history_pinned_only', text='', icon='FILTER')
+            wp_rot_box_row4 = workplane_rotation_box.row(align=True)
+            scope = 'SELECTED' if bpy.context.mode == 'EDIT_GPENCIL' else 'LAYER'
+            reproject = wp_rot_box_row4.operator('dt.reproject_strokes', text='project %s' % scope.lower(),
+                                                 icon='MOD_SHRINKWRAP')
+            reproject.scope, reproject.method = scope, 'ORTHO'
+            reproject = wp_rot_box_row4.operator('dt.reproject_strokes', text='along view', icon='HIDE_OFF')
+            reproject.scope, reproject.method = scope, 'VIEW'
+
+        workplane_grid_box = layout.box()
+        workplane_grid_box_title = workplane_grid_box.row(align=True)
+        workplane_grid_box_title.label(text='Grid Size', icon='GRID')
+        workplane_grid_box_title.prop(settings, 'expand_grid', text='', icon='THREE_DOTS', icon_only=True,
+                                      emboss=False)
+        if settings.expand_grid:
+            if wp:
+                workplane_grid_box_row1 = workplane_grid_box.row(align=True)
+
+                workplane_grid_box_row1_col1 = workplane_grid_box_row1.column(align=True)
+                workplane_grid_box_row1_col1.label(text='scale')
+                workplane_grid_box_row1_col1.prop(wp, 'scale', index=0, icon_only=True)
+                workplane_grid_box_row1_col1.prop(wp, 'scale', index=1, icon_only=True)
+
+                workplane_grid_box_row1_col2 = workplane_grid_box_row1.column(align=True)
+                workplane_grid_box_row1_col2.label(text='count')
+                workplane_grid_box_row1_col2.prop(settings, 'grid_count', index=0, icon_only=True)
+                workplane_grid_box_row1_col2.prop(settings, 'grid_count', index=1, icon_only=True)
+
+                workplane_grid_box.prop(settings, 'grid_edge_only', text='edges only')
+
+        workplane_grid_box_row2 = workplane_grid_box.row(align=True)
+        workplane_grid_box_row2.operator('dt.switch_scale_and_count', icon='ARROW_LEFTRIGHT', text='switch')
+        workplane_grid_box_row2.operator('dt.reset_scale', icon='LOOP_BACK', text='reset')
+        workplane_grid_box_row3 = workplane_grid_box.row(align=True)
+        workplane_grid_box_row3.label(text='culling', icon='HIDE_ON')
+        workplane_grid_box_row3.prop(settings, 'cull_mode', expand=True)
+        if settings.cull_mode != 'OFF':
+            workplane_grid_box_row4 = workplane_grid_box.row(align=True)
+            workplane_grid_box_row4.prop(settings, 'cull_distance', text='distance')
+            workplane_grid_box_row4.prop(settings, 'cull_frustum', text='view', toggle=True)
+            if settings.cull_mode == 'DIM':
+                workplane_grid_box_row4.prop(settings, 'cull_opacity', text='opacity')
+            workplane_grid_box.label(text='%d layers culled' % len(culling.state['culled']))
+
+        box_gp = layout.box()
+        # Show which GP Obj is active
+        gp_active = settings.gp_active_object
+        gp_active_name = gp_active.name if gp_active else 'empty'
+        box_gp.label(text='Grease Pencil Objects: ' + gp_active_name, icon='GREASEPENCIL')
+        box_gp_row1 = box_gp.row(align=True)
+        box_gp_row1.operator('dt.add_gp_object', icon='ADD', text='add new')
+        box_gp_row1.operator('dt.remove_gp_object', icon='REMOVE', text='del active')
+
+        box_gp_col1 = box_gp.column(align=True)
+        for gp_name in index['gp_objects']:
+            op = box_gp_col1.row()
+            if gp_name == gp_active_name:
+                op.alert = True
+            opo = op.operator('dt.select_gp_object', text=gp_name)
+            opo.gp = gp_name
+
+        analysis_box = layout.box()
+        analysis_box_title = analysis_box.row(align=True)
+        analysis_box_title.label(text='Analysis', icon='VIEWZOOM')
+        analysis_box_title.prop(settings, 'expand_analysis', text='', icon='THREE_DOTS', icon_only=True, emboss=False)
+        if settings.expand_analysis:
+            analysis_box_row1 = analysis_box.row(align=True)
+            analysis_box_row1.operator('dt.analyze_strokes', text='stats', icon='INFO').task = 'STATS'
+            analysis_box_row1.operator('dt.analyze_strokes', text='fit', icon='MOD_SMOOTH').task = 'FIT'
+            analysis_box_row1.operator('dt.analyze_strokes', text='simplify', icon='MOD_DECIM').task = 'SIMPLIFY'
+            analysis_box_col1 = analysis_box.column(align=True)
+            for job in jobs.state['jobs']:
+                analysis_box_col1.label(text='%s  %d%%' % (job['name'], 100 * jobs.progress(job)), icon='SORTTIME')
+            if jobs.state['jobs']:
+                analysis_box_col1.operator('dt.cancel_jobs', text='cancel', icon='CANCEL')
+            if jobs.state['message']:
+                analysis_box_col1.label(text=jobs.state['message'])
+
+        diagnostics_box = layout.box()
+        diagnostics_box_title = diagnostics_box.row(align=True)
+        diagnostics_box_title.label(text='Diagnostics', icon='TIME')
+        diagnostics_box_title.prop(settings, 'expand_diagnostics', text='', icon='THREE_DOTS',
+                                   icon_only=True, emboss=False)
+        if settings.expand_diagnostics:
+            diagnostics_box_row1 = diagnostics_box.row(align=True)
+            diagnostics_box_row1.prop(settings, 'diagnostics_log', text='write log')
+            diagnostics_box_row1.operator('dt.reset_diagnostics', icon='X', text='clear')
+            diagnostics_box_col1 = diagnostics_box.column(align=True)
+            diagnostics_box_col1.label(text='ms: ' + ' '.join(diagnostics.bin_labels()))
+            for row in diagnostics.summary():
+                diagnostics_box_col1.label(text='%s  %dx  median %.1f ms  max %.1f ms'
+                                                % (row['operator'][3:], row['calls'], row['median_ms'],
+                                                   row['max_ms']))
+                diagnostics_box_col1.label(text='    ops %.1f  modes %.1f  objects %d > %d  |  %s'
+                                                % (row['ops'], row['mode_switches'], row['last']['objects'][0],
+                                                   row['last']['objects'][1],
+                                                   ' '.join(str(c) for c in row['histogram'])))
+            # op.alert = True
+
+
+# tuple of all used classes
+classes = (
+    DrawchitectureSettings, SetupDrawchitecture, InitializeDrawchitecture, AddGPObject, AddRotation, AnalyzeStrokes,
+    CancelJobs, ClearPlaneAndGP, DeleteLastStroke, ExportStrokes, ImportStrokes, ManipulateWorkplane, PinWorkplane,
+    ReprojectStrokes, RemoveGPObject, ResetDiagnostics, ResetScale, RestoreWorkplane, SelectGPobject, SimplifyStrokes,
+    SnapWorkplane, SwitchScaleAndCount, WPstrokeV, WPStrokeH, WPstroke3D, WPselect3P, WPfit, AddPanel)
+
+# handlers added by register() and removed by unregister()
+handlers = (
+    ('depsgraph_update_post', scene_index_invalidate), ('undo_post', scene_index_invalidate),
+    ('redo_post', scene_index_invalidate), ('load_post', scene_index_invalidate),
+    ('depsgraph_update_post', caches_invalidate), ('undo_post', caches_invalidate),
+    ('redo_post', caches_invalidate), ('load_post', caches_invalidate),
+    ('depsgraph_update_post', strokelistener.update), ('undo_post', strokelistener.update),
+    ('redo_post', strokelistener.update), ('load_post', strokelistener.update),
+    ('load_post', gpencil_obj_name_reset), ('load_post', settings_migrate), ('load_post', culling_reset),
+    ('load_post', intersections_sync), ('load_pre', jobs.cancel_on_load), ('save_pre', culling_restore_before_save))
+
+
+# registering/unregistering classes
+def register():
+    from bpy.utils import register_class
+    for cls in classes:
+        register_class(cls)
+    bpy.types.Scene.drawchitecture = bpy.props.PointerProperty(type=DrawchitectureSettings)
+    diagnostics.install()
+    for name, handler in handlers:
+        getattr(bpy.app.handlers, name).append(handler)
+    bpy.app.timers.register(culling_tick, first_interval=0.5, persistent=True)
+    strokelistener.on_stroke_completed.append(auto_workplane)
+
+
+def unregister():
+    from bpy.utils import unregister_class
+    for name, handler in handlers:
+        if handler in getattr(bpy.app.handlers, name):
+            getattr(bpy.app.handlers, name).remove(handler)
+    if bpy.app.timers.is_registered(culling_tick):
+        bpy.app.timers.unregister(culling_tick)
+    if auto_workplane in strokelistener.on_stroke_completed:
+        strokelistener.on_stroke_completed.remove(auto_workplane)
+    strokelistener.clear()
+    if loaded(culling):
+        culling.restore()
+    if loaded(intersections):
+        intersections.hide()
+    jobs.shutdown()
+    diagnostics.uninstall()
+    del bpy.types.Scene.drawchitecture
+    for cls in reversed(classes):
+        unregister_class(cls)
@@ -0,0 +1,78 @@
+"""stroke analysis run as jobs: snapshot() copies the points on the main thread, the other functions
+only work on the copied arrays and run in a worker of jobs (one step per frame)
+"""
+import numpy as np
+
+from . import geometry, jobs, snapping
+
+
+def concatenated(frames):
+    """returns points (N,3) and offsets (S+1,) of all strokes of the frames
+    """
+    if not frames:
+        return np.empty((0, 3)), np.zeros(1, dtype=np.int64)
+    co = np.concatenate([co for co, offsets in frames])
+    counts = np.concatenate([offsets[1:] - offsets[:-1] for co, offsets in frames])
+    return co, np.concatenate(((0,), np.cumsum(counts)))
+
+
+def fit(job, frames):
+    """returns centroid, normal, rms, planarity (geometry.fit_plane) of all points and their number
+    """
+    co, offsets = concatenated(frames)
+    jobs.step(job, len(frames))
+    centroid, normal, rms, planarity = geometry.fit_plane(co)
+    jobs.step(job)
+    return centroid, normal, rms, planarity, len(co)
+
+
+def simplify_preview(job, frames, epsilon):
+    """returns number of points before + after geometry.simplify_mask(), the strokes are not changed
+    """
+    before = after = 0
+    for co, offsets in frames:
+        before += len(co)
+        after += int(geometry.simplify_mask(co, offsets, epsilon).sum())
+        jobs.step(job)
+    return before, after
+
+
+def snapshot(gp_objects):
+    """main thread: returns list of points (N,3) in world space + offsets (S+1,) of the active frame
+    of every layer of the GP objects, copies that stay valid while the strokes change
+    """
+    frames = []
+    for obj in gp_objects:
+        for layer in obj.data.layers:
+            if layer.active_frame is None or not layer.active_frame.strokes:
+                continue
+            strokes = layer.active_frame.strokes
+            counts = np.fromiter((len(stroke.points) for stroke in strokes), dtype=np.int64, count=len(strokes))
+            frames.append((snapping.stroke_points_world(strokes, obj.matrix_world),
+                           np.concatenate(((0,), np.cumsum(counts)))))
+    return frames
+
+
+def stats(job, frames):
+    """returns dict: strokes, points, length (sum of all stroke lengths), bbox_min, bbox_max,
+    planar (strokes with planarity > 0.9), of all strokes of the frames
+    """
+    result = {'strokes': 0, 'points': 0, 'length': 0.0, 'planar': 0,
+              'bbox_min': np.full(3, np.inf), 'bbox_max': np.full(3, -np.inf)}
+    for co, offsets in frames:
+        meta = geometry.stroke_metadata(co, offsets)
+        segment = np.linalg.norm(np.diff(co, axis=0), axis=1)
+        # no segment from the last point of a stroke to the first of the next one
+        inner = np.ones(len(segment), dtype=bool)
+        starts = offsets[1:-1]
+        inner[starts[(starts > 0) & (starts < len(co))] - 1] = False
+        filled = meta['count'] > 0
+        result['strokes'] += len(offsets) - 1
+        result['points'] += len(co)
+        result['length'] += float(segment[inner].sum())
+        result['planar'] += int((meta['planarity'] > 0.9).sum())
+        if filled.any():
+            result['bbox_min'] = np.minimum(result['bbox_min'], meta['bbox_min'][filled].min(axis=0))
+            result['bbox_max'] = np.maximum(result['bbox_max'], meta['bbox_max'][filled].max(axis=0))
+        jobs.step(job)
+    return result
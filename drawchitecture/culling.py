@@ -0,0 +1,130 @@
+"""hides or dims GP layers far from the workplane or outside the view, while drawing into big models
+
+distance is measured along the workplane normal, layers on the plane are kept however far from its origin
+the world space bounds of every layer come from the cached stroke bounding boxes (strokecache)
+and are kept while the strokecache generation and the object matrix stay the same
+update() only runs when the workplane, the view, the settings or the layers changed since the last call,
+only layers whose culling state changes are touched: layers hidden by the user are never shown
+"""
+import bpy
+import numpy as np
+
+from mathutils import Vector
+
+from . import geometry, strokecache
+
+# world bounds by frame pointer, culled layers by layer pointer with their original hide + opacity
+state = {'key': None, 'bounds': {}, 'culled': {}}
+
+
+def layer_bounds(obj, layer):
+    """returns world space min, max (3,) of the active frame of layer, None for frames without points
+    """
+    frame = layer.active_frame
+    if frame is None or not frame.strokes:
+        return None
+    matrix = tuple(tuple(row) for row in obj.matrix_world)
+    # strokecache checks the strokes of the frame again in every new generation (moved points too)
+    signature = (strokecache.cache['generation'], matrix)
+    entry = state['bounds'].get(frame.as_pointer())
+    if entry is not None and entry[0] == signature:
+        return entry[1]
+
+    meta = strokecache.frame_metadata(frame)
+    filled = meta['count'] > 0
+    bounds = None
+    if filled.any():
+        box_min, box_max = meta['bbox_min'][filled].min(axis=0), meta['bbox_max'][filled].max(axis=0)
+        corners = np.array([np.where([x, y, z], box_max, box_min) for x in (0, 1) for y in (0, 1) for z in (0, 1)])
+        matrix = np.array(matrix)
+        corners = corners @ matrix[:3, :3].T + matrix[:3, 3]
+        bounds = corners.min(axis=0), corners.max(axis=0)
+    state['bounds'][frame.as_pointer()] = (signature, bounds)
+    return bounds
+
+
+@bpy.app.handlers.persistent
+def reset(*args):
+    """handler (file load): pointers of the old file are not valid any more
+    """
+    state['bounds'].clear()
+    state['culled'].clear()
+    state['key'] = None
+
+
+def restore(pointers=None):
+    """shows / restores the opacity of the culled layers (default: all), found by object + layer name
+    """
+    for pointer in list(state['culled']) if pointers is None else pointers:
+        obj_name, layer_name, hide, opacity = state['culled'].pop(pointer)
+        obj = bpy.data.objects.get(obj_name)
+        layer = obj.data.layers.get(layer_name) if obj is not None and obj.type == 'GPENCIL' else None
+        if layer is not None:
+            layer.hide = hide
+            layer.opacity = opacity
+    if pointers is None:
+        state['key'] = None
+
+
+@bpy.app.handlers.persistent
+def restore_before_save(*args):
+    """handler (save pre): culled layers are saved with their original visibility, culled again afterwards
+    """
+    restore()
+
+
+def update(scene, wp, perspective_matrix):
+    """culls the layers of the visible GP objects of the scene, the active layer of the active GP is kept
+    wp: workplane object or None (no distance culling), perspective_matrix: of the 3D view or None
+    returns number of culled layers
+    """
+    settings = scene.drawchitecture
+    layers = []
+    for obj in scene.objects:
+        if obj.type != 'GPENCIL' or not obj.visible_get():
+            continue
+        active = obj.data.layers.active if obj == settings.gp_active_object else None
+        for layer in obj.data.layers:
+            if layer != active and (not layer.hide or layer.as_pointer() in state['culled']):
+                layers.append((obj, layer))
+
+    frames = tuple((layer.as_pointer(), len(layer.active_frame.strokes) if layer.active_frame else 0)
+                   for obj, layer in layers)
+    key = (strokecache.cache['generation'], tuple(map(tuple, wp.matrix_world)) if wp is not None else None,
+           tuple(map(tuple, perspective_matrix)) if perspective_matrix is not None else None,
+           settings.cull_mode, settings.cull_distance, settings.cull_frustum, settings.cull_opacity, frames)
+    if key == state['key']:
+        return len(state['culled'])
+    state['key'] = key
+
+    # layers that are not culled any more: active now, object hidden or removed
+    restore(set(state['culled']) - set(layer.as_pointer() for obj, layer in layers))
+
+    bounds = [layer_bounds(obj, layer) for obj, layer in layers]
+    known = np.array([b is not None for b in bounds], dtype=bool)
+    box_min = np.array([b[0] if b is not None else (0, 0, 0) for b in bounds]).reshape(-1, 3)
+    box_max = np.array([b[1] if b is not None else (0, 0, 0) for b in bounds]).reshape(-1, 3)
+    cull = np.zeros(len(layers), dtype=bool)
+    if wp is not None and settings.cull_distance > 0:
+        normal = wp.matrix_world.to_3x3() @ Vector((0, 0, 1))
+        cull |= (geometry.box_plane_distance(wp.matrix_world.translation, normal, box_min, box_max)
+                 > settings.cull_distance)
+    if perspective_matrix is not None and settings.cull_frustum:
+        cull |= geometry.box_outside_frustum(perspective_matrix, box_min, box_max)
+    cull &= known
+
+    for (obj, layer), culled in zip(layers, cull.tolist()):
+        pointer = layer.as_pointer()
+        if culled and pointer not in state['culled']:
+            state['culled'][pointer] = (obj.name, layer.info, layer.hide, layer.opacity)
+        elif not culled and pointer in state['culled']:
+            restore([pointer])
+            continue
+        if culled:
+            opacity = state['culled'][pointer][3] * settings.cull_opacity
+            if settings.cull_mode == 'HIDE' and not layer.hide:
+                layer.hide = True
+            elif settings.cull_mode == 'DIM' and (layer.hide or abs(layer.opacity - opacity) > 1e-4):
+                layer.hide = False
+                layer.opacity = opacity
+    return len(state['culled'])
@@ -0,0 +1,149 @@
+"""timing of operator execute() calls, shown in the Diagnostics box of AddPanel
+
+every instrumented execute() records wall time, the number of bpy.ops calls and mode switches
+made inside of it and the number of objects before / after
+records are kept in memory (last HISTORY calls per operator) and, if scene.drawchitecture.diagnostics_log is set,
+appended as json lines to log_path()
+"""
+import collections
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import bpy
+import bpy.ops
+
+# upper limits (ms) of the histogram bins, the last bin is open
+BINS_MS = (1, 5, 20, 100, 500)
+# number of calls kept per operator
+HISTORY = 100
+
+# last records by bl_idname
+records = collections.defaultdict(lambda: collections.deque(maxlen=HISTORY))
+# counters of the running execute() calls, innermost last
+counters = []
+# original op call function of bpy.ops while install() is active
+op_call_original = {}
+
+
+def bin_counts(times):
+    """returns number of times in each bin of BINS_MS
+    """
+    counts = [0] * (len(BINS_MS) + 1)
+    for t in times:
+        i = 0
+        while i < len(BINS_MS) and t >= BINS_MS[i]:
+            i = i + 1
+        counts[i] += 1
+    return counts
+
+
+def bin_labels():
+    """returns labels of the histogram bins ('<1', '<5', ..., '>=500')
+    """
+    return ['<' + str(b) for b in BINS_MS] + ['>=' + str(BINS_MS[-1])]
+
+
+def install():
+    """counts every bpy.ops call while an instrumented execute() runs
+    """
+    if op_call_original:
+        return
+    module = sys.modules['bpy.ops']
+    # name of the call function differs between Blender versions
+    name = '_op_call' if hasattr(module, '_op_call') else 'op_call'
+    original = getattr(module, name)
+
+    def op_call(idname, *args):
+        for counter in counters:
+            counter['ops'] += 1
+            if idname in ('object.mode_set', 'OBJECT_OT_mode_set'):
+                counter['mode_switches'] += 1
+        return original(idname, *args)
+
+    op_call_original[name] = original
+    setattr(module, name, op_call)
+
+
+def instrumented(execute):
+    """decorator for Operator.execute(), records one entry per call
+    """
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        counter = {'ops': 0, 'mode_switches': 0}
+        counters.append(counter)
+        objects_before = len(bpy.data.objects)
+        mode_before = context.mode
+        start = time.perf_counter()
+        result = None
+        try:
+            result = execute(self, context)
+            return result
+        finally:
+            ms = (time.perf_counter() - start) * 1000
+            counters.remove(counter)
+            record = {
+                'operator': self.bl_idname,
+                'time': time.time(),
+                'ms': ms,
+                'ops': counter['ops'],
+                'mode_switches': counter['mode_switches'],
+                'mode': (mode_before, bpy.context.mode),
+                'objects': (objects_before, len(bpy.data.objects)),
+                'result': sorted(result) if isinstance(result, set) else None,
+            }
+            records[self.bl_idname].append(record)
+            if getattr(getattr(bpy.context.scene, 'drawchitecture', None), 'diagnostics_log', False):
+                write_log(record)
+    return wrapper
+
+
+def log_path():
+    """returns path of the json lines log
+    """
+    return os.path.join(bpy.app.tempdir or tempfile.gettempdir(), 'drawchitecture_diagnostics.jsonl')
+
+
+def summary():
+    """returns list of dicts per operator: calls, median / max ms, mean ops + mode switches, histogram
+    """
+    rows = []
+    for idname in sorted(records):
+        entries = records[idname]
+        if not entries:
+            continue
+        times = [r['ms'] for r in entries]
+        rows.append({
+            'operator': idname,
+            'calls': len(entries),
+            'median_ms': statistics.median(times),
+            'max_ms': max(times),
+            'ops': statistics.mean(r['ops'] for r in entries),
+            'mode_switches': statistics.mean(r['mode_switches'] for r in entries),
+            'last': entries[-1],
+            'histogram': bin_counts(times),
+        })
+    return rows
+
+
+def uninstall():
+    """restores the bpy.ops call function
+    """
+    module = sys.modules['bpy.ops']
+    for name, original in op_call_original.items():
+        setattr(module, name, original)
+    op_call_original.clear()
+
+
+def write_log(record):
+    """appends record as one json line to log_path()
+    """
+    try:
+        with open(log_path(), 'a') as f:
+            f.write(json.dumps(record) + '\n')
+    except OSError as error:
+        print('diagnostics: log not written: ' + str(error))
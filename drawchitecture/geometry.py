@@ -0,0 +1,315 @@
+"""workplane orientation for many point pairs at once
+
+only needs numpy, bpy and mathutils are not imported: outside of Blender add the
+drawchitecture folder to sys.path and use 'import geometry'
+all points are (N,3) arrays, a single point (3,) is treated as N = 1
+rotations are euler angles in 'XYZ' order like object.rotation_euler
+"""
+import numpy as np
+
+# plane modes of plane_array()
+MODES = ('1p', '3p', 'bp', 'h', 'v', '3d')
+
+
+def as_points(points):
+    """returns points as float64 array of shape (N,3)
+    """
+    return np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+
+def box_plane_distance(origin, normal, box_min, box_max):
+    """returns distance (N,) along normal of the plane through origin (3,) to the axis aligned boxes
+    box_min, box_max (N,3), 0 for boxes the plane passes through
+    """
+    normal = as_points(normal)[0]
+    normal = normal / np.linalg.norm(normal)
+    box_min, box_max = as_points(box_min), as_points(box_max)
+    center = (box_min + box_max) / 2
+    # half extent of the boxes projected onto the normal
+    extent = (box_max - box_min) / 2 @ np.abs(normal)
+    return np.maximum(np.abs((center - as_points(origin)[0]) @ normal) - extent, 0)
+
+
+def box_outside_frustum(matrix, box_min, box_max):
+    """returns mask (N,) of the axis aligned boxes (N,3) completely outside the view frustum
+    matrix: perspective matrix (4,4) world -> clip space of the view (region_3d.perspective_matrix)
+    a box is outside when all 8 corners are outside the same clip plane, boxes crossing the edges are kept
+    """
+    box_min, box_max = as_points(box_min), as_points(box_max)
+    corners = np.stack([np.where([x, y, z], box_max, box_min)
+                        for x in (0, 1) for y in (0, 1) for z in (0, 1)], axis=1)
+    clip = np.concatenate((corners, np.ones(corners.shape[:2] + (1,))), axis=2) @ np.asarray(matrix).T
+    xyz, w = clip[:, :, :3], clip[:, :, 3:]
+    outside = (xyz < -w).all(axis=1) | (xyz > w).all(axis=1)
+    return outside.any(axis=1)
+
+
+def direction_2p(point_a, point_b):
+    """returns the vectors between the point pairs, always pointing in negative x direction
+    (same orientation for a stroke drawn left to right or right to left)
+    """
+    point_a = as_points(point_a)
+    point_b = as_points(point_b)
+    return np.where((point_a[:, 0] > point_b[:, 0])[:, None], point_b - point_a, point_a - point_b)
+
+
+def euler_to_matrix(euler):
+    """returns rotation matrices (N,3,3) of euler angles (N,3) in 'XYZ' order
+    """
+    euler = as_points(euler)
+    sx, sy, sz = np.sin(euler).T
+    cx, cy, cz = np.cos(euler).T
+    # Rz @ Ry @ Rx
+    matrix = np.empty((len(euler), 3, 3))
+    matrix[:, 0, 0] = cy * cz
+    matrix[:, 0, 1] = sx * sy * cz - cx * sz
+    matrix[:, 0, 2] = cx * sy * cz + sx * sz
+    matrix[:, 1, 0] = cy * sz
+    matrix[:, 1, 1] = sx * sy * sz + cx * cz
+    matrix[:, 1, 2] = cx * sy * sz - sx * cz
+    matrix[:, 2, 0] = -sy
+    matrix[:, 2, 1] = sx * cy
+    matrix[:, 2, 2] = cx * cy
+    return matrix
+
+
+def location_2p(point_a, point_b):
+    """returns midpoints of lines between the point pairs
+    """
+    return (as_points(point_a) + as_points(point_b)) / 2
+
+
+def normal_3p(point_a, point_b, point_c):
+    """returns (not normalized) normal vectors of the planes through 3 points
+    """
+    point_a = as_points(point_a)
+    return np.cross(as_points(point_b) - point_a, as_points(point_c) - point_a)
+
+
+def plane_frames(point_a, point_b, mode):
+    """returns location (N,3), rotation matrix (N,3,3) and euler rotation (N,3) of workplanes
+    mode '1p': horizontal plane at point_a
+    mode '3p': plane at point_a, point_b is point_a + normal of the plane
+    modes 'h' / 'bp' / 'v' / '3d': horizontal / vertical / tilted plane at the midpoint of point_a + point_b
+    """
+    if mode not in MODES:
+        raise ValueError('plane_frames: mode must be one of ' + ', '.join(MODES))
+    point_a = as_points(point_a)
+    point_b = as_points(point_b)
+    euler = np.zeros((max(len(point_a), len(point_b)), 3))
+
+    if mode in ('1p', '3p'):
+        location = np.broadcast_to(point_a, euler.shape).copy()
+    else:
+        location = location_2p(point_a, point_b)
+
+    if mode != '1p':
+        euler[:, 2] = rotation_z(point_a, point_b)
+    if mode == 'v':
+        euler[:, 1] = np.pi / 2
+    elif mode == '3d':
+        euler[:, 0] = rotation_x(point_a, point_b)
+    elif mode == '3p':
+        # normal vector: adding 90 degrees to the x rotation
+        euler[:, 0] = np.pi / 2 + rotation_x(point_a, point_b)
+
+    return location, euler_to_matrix(euler), euler
+
+
+def plane_crossings(co, offsets, origin, normal, heights=None):
+    """returns points (M,3) where the segments of all strokes cross the plane through origin with normal
+    and the index (M,) of the stroke of every crossing, points of stroke i are offsets[i]:offsets[i+1]
+    heights: co @ unit normal if already known, moving the plane along its normal only changes origin
+    a crossing is a sign change of the distance between two neighbouring points of a stroke
+    """
+    co = as_points(co)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    normal = as_points(normal)[0]
+    normal = normal / np.linalg.norm(normal)
+    if heights is None:
+        heights = co @ normal
+    if len(co) < 2:
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+    distance = heights - as_points(origin)[0] @ normal
+    a, b = distance[:-1], distance[1:]
+    # no segment from the last point of a stroke to the first of the next one
+    segment = np.ones(len(co) - 1, dtype=bool)
+    last = offsets[1:] - 1
+    segment[last[(last >= 0) & (last < len(co) - 1)]] = False
+    crossing = np.flatnonzero(segment & ((a < 0) != (b < 0)))
+    t = a[crossing] / (a[crossing] - b[crossing])
+    points = co[crossing] + t[:, None] * (co[crossing + 1] - co[crossing])
+    return points, np.searchsorted(offsets, crossing, side='right') - 1
+
+
+def project_to_plane(points, origin, normal, direction=None):
+    """returns points (N,3) moved onto the plane through origin (3,) with normal (3,)
+    direction None: orthogonal projection, else along direction (3,) or one direction per point (N,3)
+    points whose direction is parallel to the plane are projected orthogonally
+    """
+    points = as_points(points)
+    origin = as_points(origin)[0]
+    normal = as_points(normal)[0]
+    normal = normal / np.linalg.norm(normal)
+    distance = (points - origin) @ normal
+    if direction is None:
+        return points - distance[:, None] * normal
+    direction = np.broadcast_to(as_points(direction), points.shape)
+    along = direction @ normal
+    parallel = np.abs(along) < 1e-9 * np.linalg.norm(direction, axis=1)
+    # orthogonal where the direction does not cross the plane
+    direction = np.where(parallel[:, None], normal, direction)
+    along = np.where(parallel, 1.0, along)
+    return points - (distance / along)[:, None] * direction
+
+
+def rotation_x(point_a, point_b):
+    """returns x rotation (N,) of tilted planes by z difference and projected distance of the point pairs
+    """
+    v_2p = direction_2p(point_a, point_b)
+    return np.arctan2(v_2p[:, 2], np.hypot(v_2p[:, 0], v_2p[:, 1]))
+
+
+def rotation_z(point_a, point_b):
+    """returns z rotation (N,) that turns the y axis in line with the point pairs seen from top
+    """
+    v_2p = direction_2p(point_a, point_b)
+    return np.arctan2(-v_2p[:, 0], v_2p[:, 1])
+
+
+def fit_plane(points):
+    """returns centroid (3,), unit normal (3,), rms distance of the points to the plane and planarity
+    of the best-fit plane through all points (least squares: eigenvectors of the covariance)
+    planarity is 1 - smallest / middle eigenvalue: 1 for points in a plane, 0 if no plane is preferred
+    or the points are on a line
+    the normal points upwards (z >= 0), nan values are returned for less than 3 points
+    """
+    points = as_points(points)
+    if len(points) < 3:
+        return np.full(3, np.nan), np.full(3, np.nan), np.nan, np.nan
+    centroid = points.mean(axis=0)
+    centered = points - centroid
+    # eigenvalues in ascending order, first eigenvector is the normal
+    eigenvalues, eigenvectors = np.linalg.eigh(centered.T @ centered / len(points))
+    eigenvalues = np.clip(eigenvalues, 0, None)
+    normal = eigenvectors[:, 0]
+    if normal[2] < 0:
+        normal = -normal
+    rms = np.sqrt(eigenvalues[0])
+    # points on a line do not define a plane
+    planarity = 1 - eigenvalues[0] / eigenvalues[1] if eigenvalues[1] > 1e-9 * eigenvalues[2] else 0.0
+    return centroid, normal, rms, planarity
+
+
+def simplify_mask(co, offsets, epsilon):
+    """returns mask (N,) of the points to keep when simplifying strokes (Ramer-Douglas-Peucker)
+    co: points (N,3) of all strokes, offsets: (S+1,) points of stroke i are offsets[i]:offsets[i+1]
+    all strokes are done at once: every pass splits all open segments whose farthest point is more than
+    epsilon away from the line between their end points, segments without such a point are done
+    first and last point of a stroke are kept
+    """
+    co = as_points(co)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    keep = np.zeros(len(co), dtype=bool)
+    filled = offsets[1:] > offsets[:-1]
+    # open segments: index of first + last point
+    seg_a = offsets[:-1][filled]
+    seg_b = offsets[1:][filled] - 1
+    keep[seg_a] = True
+    keep[seg_b] = True
+
+    while len(seg_a):
+        inner = seg_b - seg_a - 1
+        seg_a, seg_b, inner = seg_a[inner > 0], seg_b[inner > 0], inner[inner > 0]
+        if len(seg_a) == 0:
+            break
+        # inner points of all open segments, grouped by segment
+        group_start = np.cumsum(inner) - inner
+        segment = np.repeat(np.arange(len(seg_a)), inner)
+        points = np.arange(inner.sum()) - group_start[segment] + seg_a[segment] + 1
+
+        point_a = co[seg_a[segment]]
+        line = co[seg_b[segment]] - point_a
+        length = np.linalg.norm(line, axis=1)
+        distance = np.where(length > 0,
+                            np.linalg.norm(np.cross(co[points] - point_a, line), axis=1)
+                            / np.where(length > 0, length, 1),
+                            np.linalg.norm(co[points] - point_a, axis=1))
+
+        # farthest point of every segment, split where it is too far away
+        farthest = np.maximum.reduceat(distance, group_start)
+        candidate = np.flatnonzero((distance == farthest[segment]) & (farthest[segment] > epsilon))
+        split_segments, first = np.unique(segment[candidate], return_index=True)
+        split = points[candidate[first]]
+        keep[split] = True
+        seg_a, seg_b = (np.concatenate((seg_a[split_segments], split)),
+                        np.concatenate((split, seg_b[split_segments])))
+    return keep
+
+
+def stroke_checksum(co, offsets):
+    """returns checksum (S,) of every stroke, points of stroke i are offsets[i]:offsets[i+1]
+    changes when any point of the stroke moves, nan for strokes without points
+    """
+    co = as_points(co)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = offsets[1:] - offsets[:-1]
+    filled = counts > 0
+    starts = offsets[:-1][filled]
+    checksum = np.full(len(counts), np.nan)
+    if filled.any():
+        # position in the stroke weights the points: reordered points change the checksum too
+        local = np.arange(len(co)) - np.repeat(starts, counts[filled]) + 1
+        checksum[filled] = np.add.reduceat(co @ (1.0, 1.618, 2.718) * local, starts)
+    return checksum
+
+
+def stroke_metadata(co, offsets):
+    """returns dict of per stroke arrays for all strokes at once, points of stroke i are offsets[i]:offsets[i+1]
+    bbox_min, bbox_max, centroid, first, last, direction (unit vector first -> last point),
+    normal, rms, planarity (like fit_plane), checksum (changes when any point of the stroke moves)
+    values of strokes without points are nan, normal + rms + planarity are nan for less than 3 points
+    """
+    co = as_points(co)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = offsets[1:] - offsets[:-1]
+    n = len(counts)
+    filled = counts > 0
+    starts = offsets[:-1][filled]
+    meta = {key: np.full((n, 3), np.nan) for key in ('bbox_min', 'bbox_max', 'centroid', 'first', 'last',
+                                                     'direction', 'normal')}
+    meta.update({key: np.full(n, np.nan) for key in ('rms', 'planarity')})
+    meta['checksum'] = stroke_checksum(co, offsets)
+    meta['count'] = counts
+    if not filled.any():
+        return meta
+
+    # reduceat over the start of every stroke with points (empty strokes are skipped)
+    meta['bbox_min'][filled] = np.minimum.reduceat(co, starts)
+    meta['bbox_max'][filled] = np.maximum.reduceat(co, starts)
+    centroid = np.add.reduceat(co, starts) / counts[filled, None]
+    meta['centroid'][filled] = centroid
+    meta['first'][filled] = co[starts]
+    meta['last'][filled] = co[offsets[1:][filled] - 1]
+    line = meta['last'] - meta['first']
+    length = np.linalg.norm(line, axis=1)
+    meta['direction'] = np.divide(line, length[:, None], out=np.full((n, 3), np.nan), where=length[:, None] > 0)
+
+    # covariance of every stroke, eigenvectors in ascending order: first is the normal
+    stroke = np.repeat(np.arange(len(starts)), counts[filled])
+    centered = co - centroid[stroke]
+    outer = (centered[:, :, None] * centered[:, None, :]).reshape(-1, 9)
+    covariance = (np.add.reduceat(outer, starts) / counts[filled, None]).reshape(-1, 3, 3)
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    eigenvalues = np.clip(eigenvalues, 0, None)
+    normal = eigenvectors[:, :, 0]
+    normal[normal[:, 2] < 0] *= -1
+    line_like = eigenvalues[:, 1] <= 1e-9 * eigenvalues[:, 2]
+    planarity = 1 - eigenvalues[:, 0] / np.where(line_like, 1, eigenvalues[:, 1])
+    planarity[line_like] = 0.0
+    enough = counts[filled] >= 3
+    index = np.flatnonzero(filled)[enough]
+    meta['normal'][index] = normal[enough]
+    meta['rms'][index] = np.sqrt(eigenvalues[enough, 0])
+    meta['planarity'][index] = planarity[enough]
+    return meta
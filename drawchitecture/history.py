@@ -0,0 +1,111 @@
+"""history of workplanes, stored in the scene as one contiguous float array
+
+every entry holds location, rotation, scale, grid count and a pin flag (STRIDE values)
+the array grows by doubling its capacity, so adding an entry is O(1) on average,
+reading or restoring an entry is O(1) regardless of the number of stored planes
+the history is saved with the file: when the array is full, only the last LIMIT entries that are not pinned
+are kept (and all pinned ones), so it stays below twice that size
+"""
+
+# scene custom properties
+KEY_DATA = 'dt_wp_history'
+KEY_LEN = 'dt_wp_history_len'
+KEY_POS = 'dt_wp_history_pos'
+
+# location (3), rotation (3), scale (3), grid count (2), pinned (1)
+STRIDE = 12
+CAPACITY_MIN = 16
+# entries kept that are not pinned
+LIMIT = 100
+
+
+def clear(scene, keep_pinned=True):
+    """removes all entries, pinned entries are kept (in their order) with keep_pinned, returns number removed
+    """
+    n = length(scene)
+    data = scene.get(KEY_DATA)
+    if data is None:
+        return 0
+    values = data.to_list()
+    kept = [values[i * STRIDE:(i + 1) * STRIDE] for i in range(n) if keep_pinned and values[i * STRIDE + 11] > 0]
+    if kept:
+        scene[KEY_DATA] = [v for values in kept for v in values]
+        scene[KEY_LEN] = len(kept)
+        scene[KEY_POS] = len(kept) - 1
+    else:
+        for key in (KEY_DATA, KEY_LEN, KEY_POS):
+            if key in scene:
+                del scene[key]
+    return n - len(kept)
+
+
+def entry(scene, index):
+    """returns dict of the entry at index
+    """
+    values = scene[KEY_DATA][index * STRIDE:(index + 1) * STRIDE]
+    return {
+        'location': tuple(values[0:3]),
+        'rotation': tuple(values[3:6]),
+        'scale': tuple(values[6:9]),
+        'grid_count': (int(values[9]), int(values[10])),
+        'pinned': values[11] > 0,
+    }
+
+
+def length(scene):
+    """returns number of stored workplanes
+    """
+    return scene.get(KEY_LEN, 0)
+
+
+def position(scene):
+    """returns index of the workplane restored / added last, -1 if the history is empty
+    """
+    return scene.get(KEY_POS, -1)
+
+
+def push(scene, wp, pinned=False):
+    """adds the current state of workplane wp at the end of the history and returns its index
+    """
+    n = length(scene)
+    data = scene.get(KEY_DATA)
+    capacity = len(data) // STRIDE if data is not None else 0
+    if n >= capacity:
+        values = data.to_list()[:n * STRIDE] if data is not None else []
+        unpinned = [i for i in range(n) if values[i * STRIDE + 11] <= 0]
+        if len(unpinned) >= LIMIT:
+            dropped = set(unpinned[:len(unpinned) - LIMIT + 1])
+            values = [v for i in range(n) if i not in dropped for v in values[i * STRIDE:(i + 1) * STRIDE]]
+            n = len(values) // STRIDE
+        # doubling the capacity if still full, the values are copied only now
+        if n >= capacity:
+            capacity = max(CAPACITY_MIN, capacity * 2)
+        values.extend([0.0] * (capacity * STRIDE - len(values)))
+        scene[KEY_DATA] = values
+        data = scene[KEY_DATA]
+
+    count = scene.drawchitecture.grid_count
+    data[n * STRIDE:(n + 1) * STRIDE] = (tuple(wp.location) + tuple(wp.rotation_euler) + tuple(wp.scale)
+                                        + (count[0], count[1], 1.0 if pinned else 0.0))
+    scene[KEY_LEN] = n + 1
+    scene[KEY_POS] = n
+    return n
+
+
+def set_position(scene, index):
+    """sets index of the workplane restored last
+    """
+    scene[KEY_POS] = index
+
+
+def step(scene, direction, pinned_only=False):
+    """returns index of the next (direction 1) or previous (-1) entry from the current position, or None
+    pinned_only skips entries that are not pinned
+    """
+    n = length(scene)
+    index = position(scene) + direction
+    while 0 <= index < n:
+        if not pinned_only or scene[KEY_DATA][index * STRIDE + 11] > 0:
+            return index
+        index = index + direction
+    return None
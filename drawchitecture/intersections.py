@@ -0,0 +1,139 @@
+"""points where the strokes of the visible GP objects cross the workplane, drawn as markers in the 3D view
+and used as snap targets
+
+the points of the active frames are kept in world space, frames are only read again when they changed
+(new strokes, moved object) or their GP data was updated (points moved, e.g. reprojected or edited),
+the heights of all points along the workplane normal are kept until the normal changes:
+moving the plane along its normal (plane_offset) only repeats the sign test of geometry.plane_crossings()
+"""
+import bgl
+import bpy
+import gpu
+import numpy as np
+
+from gpu_extras.batch import batch_for_shader
+from mathutils import Vector
+
+from . import geometry, snapping
+
+# world space points by frame pointer, all points concatenated, crossings of the last workplane
+state = {'dirty': True, 'stale': set(), 'frames': {}, 'co': np.empty((0, 3)), 'offsets': np.zeros(1, dtype=np.int64),
+         'order': [], 'normal': None, 'heights': None, 'key': None, 'points': np.empty((0, 3)), 'batch': None,
+         'handle': None}
+
+MARKER_COLOR = (1.0, 0.45, 0.0, 1.0)
+MARKER_SIZE = 7.0
+
+
+def crossings(wp):
+    """returns crossings (M,3) of the strokes with the plane of the workplane object wp (world space)
+    """
+    matrix = wp.matrix_world
+    normal = tuple(matrix.to_3x3() @ Vector((0, 0, 1)))
+    # update() resets the key when the points changed
+    key = (tuple(matrix.translation), normal)
+    if key == state['key']:
+        return state['points']
+    if normal != state['normal']:
+        unit = np.array(normal) / np.linalg.norm(normal)
+        state['heights'] = state['co'] @ unit
+        state['normal'] = normal
+    state['points'], _ = geometry.plane_crossings(state['co'], state['offsets'], tuple(matrix.translation), normal,
+                                                  state['heights'])
+    state['key'] = key
+    state['batch'] = None
+    return state['points']
+
+
+def draw():
+    """draw handler (3D view, POST_VIEW): markers at the crossings with workplane_TEMPORARY
+    """
+    wp = bpy.data.objects.get('workplane_TEMPORARY')
+    if wp is None or bpy.context.scene is None:
+        return
+    update(bpy.context.scene)
+    points = crossings(wp)
+    if not len(points):
+        return
+    shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+    if state['batch'] is None:
+        state['batch'] = batch_for_shader(shader, 'POINTS', {'pos': points.astype(np.float32)})
+    bgl.glPointSize(MARKER_SIZE)
+    shader.bind()
+    shader.uniform_float('color', MARKER_COLOR)
+    state['batch'].draw(shader)
+    bgl.glPointSize(1.0)
+
+
+def hide():
+    """removes the draw handler
+    """
+    if state['handle'] is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(state['handle'], 'WINDOW')
+        state['handle'] = None
+
+
+@bpy.app.handlers.persistent
+def invalidate(scene, *args):
+    """handler (depsgraph update, undo, file load): frames are checked again by the next update()
+    """
+    depsgraph = args[0] if args else None
+    if not isinstance(depsgraph, bpy.types.Depsgraph):
+        state['dirty'] = True
+        state['frames'].clear()
+    elif depsgraph.id_type_updated('GPENCIL') or depsgraph.id_type_updated('OBJECT'):
+        state['dirty'] = True
+        # points of the updated GP data may have moved without changing the frame signature
+        state['stale'].update(update.id.name for update in depsgraph.updates
+                              if isinstance(update.id, bpy.types.GreasePencil))
+
+
+def show():
+    """adds the draw handler (once)
+    """
+    if state['handle'] is None:
+        state['handle'] = bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+
+
+def update(scene):
+    """brings the points up to date with the active frames of the visible GP objects of the scene
+    """
+    if not state['dirty']:
+        return
+    state['dirty'] = False
+    stale = state['stale']
+    state['stale'] = set()
+    seen = []
+    changed = False
+    for obj in scene.objects:
+        if obj.type != 'GPENCIL' or not obj.visible_get():
+            continue
+        matrix = tuple(tuple(row) for row in obj.matrix_world)
+        for layer in obj.data.layers:
+            if layer.hide or layer.active_frame is None:
+                continue
+            key = layer.active_frame.as_pointer()
+            seen.append(key)
+            strokes = layer.active_frame.strokes
+            signature = (matrix, len(strokes), strokes[-1].as_pointer() if len(strokes) else 0,
+                         sum(len(stroke.points) for stroke in strokes))
+            entry = state['frames'].get(key)
+            if entry is None or entry['signature'] != signature or obj.data.name in stale:
+                changed = True
+                counts = np.fromiter((len(stroke.points) for stroke in strokes), dtype=np.int64, count=len(strokes))
+                state['frames'][key] = {'signature': signature, 'counts': counts,
+                                        'co': snapping.stroke_points_world(strokes, matrix)}
+    for key in set(state['frames']) - set(seen):
+        del state['frames'][key]
+        changed = True
+    # i.e. only the workplane moved: points + heights are kept
+    if not changed and seen == state['order']:
+        return
+    state['order'] = seen
+
+    frames = [state['frames'][key] for key in seen]
+    state['co'] = np.concatenate([f['co'] for f in frames]) if frames else np.empty((0, 3))
+    counts = np.concatenate([f['counts'] for f in frames]) if frames else np.empty(0, dtype=np.int64)
+    state['offsets'] = np.concatenate(((0,), np.cumsum(counts)))
+    state['normal'] = None
+    state['key'] = None
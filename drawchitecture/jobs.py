@@ -0,0 +1,125 @@
+"""analysis jobs in a pool of worker threads, results applied on the main thread by a timer
+
+submit() is called on the main thread with data that was already copied out of Blender (numpy arrays),
+the work function runs in a worker and must not touch bpy: it calls step() to report progress,
+step() raises Cancelled once the job was cancelled
+poll() (bpy.app.timers) applies the results of finished jobs and redraws the 3D views for the progress,
+the timer is only registered while jobs run
+"""
+import concurrent.futures
+import os
+import threading
+import time
+import traceback
+
+import bpy
+
+# running jobs in order of submission, last finished / cancelled / failed job, pool created by the first job
+state = {'jobs': [], 'message': '', 'executor': None}
+
+POLL_INTERVAL = 0.1
+# one core is left to Blender
+WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+class Cancelled(Exception):
+    """raised by step() in the worker of a cancelled job
+    """
+
+
+def cancel(job=None):
+    """cancels job (default: all jobs), its worker stops at the next step(), the result is dropped
+    """
+    for running in state['jobs'] if job is None else [job]:
+        running['cancelled'].set()
+        running['future'].cancel()
+
+
+@bpy.app.handlers.persistent
+def cancel_on_load(*args):
+    """handler (file load): results of jobs of the old file are not applied
+    """
+    cancel()
+
+
+def poll():
+    """timer: applies the results of finished jobs (apply(result) returns the message shown in the panel),
+    returns None when no job runs any more
+    """
+    for job in [job for job in state['jobs'] if job['future'].done()]:
+        state['jobs'].remove(job)
+        seconds = time.perf_counter() - job['started']
+        if job['cancelled'].is_set():
+            state['message'] = '%s: cancelled' % job['name']
+            continue
+        try:
+            message = job['apply'](job['future'].result())
+        except Exception as error:
+            traceback.print_exc()
+            state['message'] = '%s: failed (%s)' % (job['name'], error)
+            continue
+        state['message'] = '%s: %s (%.1f s)' % (job['name'], message, seconds)
+    redraw()
+    if state['jobs']:
+        return POLL_INTERVAL
+    return None
+
+
+def progress(job):
+    """returns 0 .. 1, part of the steps of job done
+    """
+    return min(job['done'] / job['total'], 1.0)
+
+
+def redraw():
+    """redraws the 3D views (progress in the panel)
+    """
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+def run(job, work, args):
+    """worker: work(job, *args), Cancelled ends the job without result
+    """
+    try:
+        return work(job, *args)
+    except Cancelled:
+        return None
+
+
+def shutdown():
+    """cancels all jobs and stops the timer + the pool without waiting for the workers
+    """
+    cancel()
+    state['jobs'].clear()
+    if bpy.app.timers.is_registered(poll):
+        bpy.app.timers.unregister(poll)
+    if state['executor'] is not None:
+        state['executor'].shutdown(wait=False)
+        state['executor'] = None
+
+
+def step(job, n=1):
+    """worker: n of the total steps of job are done, raises Cancelled if the job was cancelled
+    """
+    if job['cancelled'].is_set():
+        raise Cancelled()
+    job['done'] += n
+
+
+def submit(name, work, args, total, apply):
+    """runs work(job, *args) in a worker, apply(result) on the main thread once it is done
+    total: number of steps the work reports with step(), returns the job
+    """
+    if state['executor'] is None:
+        state['executor'] = concurrent.futures.ThreadPoolExecutor(max_workers=WORKERS,
+                                                                  thread_name_prefix='drawchitecture')
+    job = {'name': name, 'done': 0, 'total': max(total, 1), 'apply': apply, 'cancelled': threading.Event(),
+           'started': time.perf_counter(), 'future': None}
+    job['future'] = state['executor'].submit(run, job, work, args)
+    state['jobs'].append(job)
+    if not bpy.app.timers.is_registered(poll):
+        bpy.app.timers.register(poll, first_interval=POLL_INTERVAL, persistent=True)
+    return job
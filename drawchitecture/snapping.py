@@ -0,0 +1,153 @@
+"""spatial index over the stroke points of all visible GP objects, for snapping the workplane
+
+the points of every active frame are kept in mathutils KD-trees (in world space)
+update() only rebuilds what changed since the last call:
+- frames without changes are kept
+- strokes appended to a frame get their own small tree, merged when there are more than PARTS_MAX of them
+- frames with removed or changed strokes are rebuilt, frames that disappeared are dropped
+- frames of GP data the depsgraph updated are read again: points moved (reprojected, Editmode) rebuild the frame
+"""
+import bpy
+import numpy as np
+
+from mathutils.kdtree import KDTree
+
+# appended parts of a frame are merged into one tree when there are more
+PARTS_MAX = 8
+
+# trees by frame pointer, dirty after depsgraph updates of GP data or objects, names of updated GP data
+index = {'dirty': True, 'frames': {}, 'stale': set()}
+
+
+def build_tree(co):
+    """returns balanced KD-tree of the points co (N,3)
+    """
+    tree = KDTree(len(co))
+    for i, c in enumerate(co.tolist()):
+        tree.insert(c, i)
+    tree.balance()
+    return tree
+
+
+@bpy.app.handlers.persistent
+def invalidate(scene, *args):
+    """handler (depsgraph update, undo, file load): frames are checked again by the next update()
+    """
+    depsgraph = args[0] if args else None
+    if not isinstance(depsgraph, bpy.types.Depsgraph):
+        index['dirty'] = True
+        index['frames'].clear()
+    elif depsgraph.id_type_updated('GPENCIL') or depsgraph.id_type_updated('OBJECT'):
+        index['dirty'] = True
+        # points of the updated GP data may have moved without changing the frame signature
+        index['stale'].update(update.id.name for update in depsgraph.updates
+                              if isinstance(update.id, bpy.types.GreasePencil))
+
+
+def nearest(co, n):
+    """returns the n points (n,3) closest to co and their distances (n,)
+    """
+    found = []
+    for entry in index['frames'].values():
+        for tree, points in entry['parts']:
+            found.extend(tree.find_n(co, n))
+    found.sort(key=lambda result: result[2])
+    found = found[:n]
+    return (np.array([tuple(result[0]) for result in found]).reshape(-1, 3),
+            np.array([result[2] for result in found]))
+
+
+def points_total():
+    """returns number of indexed points
+    """
+    return sum(len(points) for entry in index['frames'].values() for tree, points in entry['parts'])
+
+
+def radius(co, r):
+    """returns all points (N,3) within distance r of co and their distances (N,)
+    """
+    found = []
+    for entry in index['frames'].values():
+        for tree, points in entry['parts']:
+            found.extend(tree.find_range(co, r))
+    return (np.array([tuple(result[0]) for result in found]).reshape(-1, 3),
+            np.array([result[2] for result in found]))
+
+
+def stroke_points_world(strokes, matrix):
+    """returns coordinates (N,3) of all points of the strokes in world space (foreach_get per stroke)
+    """
+    counts = [len(stroke.points) for stroke in strokes]
+    co = np.empty((sum(counts), 3), dtype=np.float32)
+    start = 0
+    for stroke, count in zip(strokes, counts):
+        stroke.points.foreach_get('co', co[start:start + count].ravel())
+        start = start + count
+    matrix = np.array(matrix)
+    return co @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def update(scene, rebuild=False):
+    """brings the trees up to date with the active frames of the visible GP objects of the scene
+    rebuild: build all trees again
+    """
+    if rebuild:
+        index['frames'].clear()
+    elif not index['dirty']:
+        return
+    stale = index['stale']
+    index['stale'] = set()
+    seen = set()
+    for obj in scene.objects:
+        if obj.type != 'GPENCIL' or not obj.visible_get():
+            continue
+        matrix = tuple(tuple(row) for row in obj.matrix_world)
+        for layer in obj.data.layers:
+            if layer.hide or layer.active_frame is None:
+                continue
+            key = layer.active_frame.as_pointer()
+            seen.add(key)
+            update_frame(key, layer.active_frame.strokes, matrix, obj.data.name in stale)
+    for key in set(index['frames']) - seen:
+        del index['frames'][key]
+    index['dirty'] = False
+
+
+def update_frame(key, strokes, matrix, stale=False):
+    """keeps, extends or rebuilds the trees of one frame
+    stale: the GP data was updated, all points are read and compared with the indexed ones
+    """
+    count = len(strokes)
+    last = strokes[-1].as_pointer() if count else 0
+    points = sum(len(stroke.points) for stroke in strokes)
+    entry = index['frames'].get(key)
+    co_all = None
+    if entry is not None and stale:
+        co_all = stroke_points_world(strokes, matrix)
+        indexed = [part_co for tree, part_co in entry['parts']]
+        indexed = np.concatenate(indexed) if indexed else np.empty((0, 3))
+        if len(co_all) < len(indexed) or not np.array_equal(co_all[:len(indexed)], indexed):
+            entry = None
+
+    if entry is not None and entry['matrix'] == matrix:
+        if count == entry['count'] and last == entry['last'] and points == entry['points']:
+            return
+        if count > entry['count'] and (entry['count'] == 0
+                                       or strokes[entry['count'] - 1].as_pointer() == entry['last']):
+            if co_all is not None:
+                co = co_all[entry['points']:]
+            else:
+                co = stroke_points_world(strokes[entry['count']:], matrix)
+            # only strokes added if the other strokes kept their points: new part for the new strokes
+            if len(co) == points - entry['points']:
+                if len(co):
+                    entry['parts'].append((build_tree(co), co))
+                if len(entry['parts']) > PARTS_MAX:
+                    co = np.concatenate([part_co for tree, part_co in entry['parts']])
+                    entry['parts'] = [(build_tree(co), co)]
+                entry.update(count=count, last=last, points=points)
+                return
+
+    co = co_all if co_all is not None else stroke_points_world(strokes, matrix)
+    index['frames'][key] = {'matrix': matrix, 'count': count, 'last': last, 'points': points,
+                            'parts': [(build_tree(co), co)] if len(co) else []}
@@ -0,0 +1,81 @@
+"""per stroke metadata (bounding box, centroid, end points, direction, fitted normal) of GP frames
+
+computed in bulk with geometry.stroke_metadata() and kept by frame pointer
+between depsgraph updates of GP data the cached arrays are returned as they are,
+after an update the points of a frame are read again and only strokes whose pointer, number of points
+or checksum changed are computed again
+"""
+import bpy
+import numpy as np
+
+from . import geometry
+
+# metadata by frame pointer, valid while the generation of the entry is the current one
+cache = {'generation': 0, 'frames': {}, 'computed': 0}
+
+
+def frame_metadata(frame):
+    """returns dict of per stroke arrays (geometry.stroke_metadata) of all strokes of frame, in local space
+    """
+    key = frame.as_pointer()
+    entry = cache['frames'].get(key)
+    if entry is not None and entry['generation'] == cache['generation']:
+        return entry['meta']
+
+    strokes = frame.strokes
+    pointers = [stroke.as_pointer() for stroke in strokes]
+    counts = np.fromiter((len(stroke.points) for stroke in strokes), dtype=np.int64, count=len(strokes))
+    offsets = np.concatenate(((0,), np.cumsum(counts)))
+    co = np.empty((offsets[-1], 3), dtype=np.float32)
+    for stroke, start, end in zip(strokes, offsets[:-1], offsets[1:]):
+        stroke.points.foreach_get('co', co[start:end].ravel())
+    checksum = geometry.stroke_checksum(co, offsets)
+
+    # rows of the cached strokes that did not change, -1 for new or changed strokes
+    rows = np.full(len(pointers), -1, dtype=np.int64)
+    if entry is not None:
+        old_rows = entry['rows']
+        old = entry['meta']
+        for i, pointer in enumerate(pointers):
+            row = old_rows.get(pointer)
+            if row is not None and old['count'][row] == counts[i] \
+                    and (counts[i] == 0 or old['checksum'][row] == checksum[i]):
+                rows[i] = row
+
+    changed = rows < 0
+    if changed.all():
+        meta = geometry.stroke_metadata(co, offsets)
+    else:
+        meta = {name: values[np.where(changed, 0, rows)] for name, values in entry['meta'].items()}
+        if changed.any():
+            points = np.repeat(changed, counts)
+            fresh = geometry.stroke_metadata(co[points], np.concatenate(((0,), np.cumsum(counts[changed]))))
+            for name, values in fresh.items():
+                meta[name][changed] = values
+    cache['computed'] += int(changed.sum())
+    cache['frames'][key] = {'generation': cache['generation'], 'meta': meta,
+                            'rows': {pointer: i for i, pointer in enumerate(pointers)}}
+    return meta
+
+
+@bpy.app.handlers.persistent
+def invalidate(scene, *args):
+    """handler (depsgraph update, undo, file load): frames are checked again when they are read next
+    """
+    depsgraph = args[0] if args else None
+    # metadata is in local space: moving objects (the workplane too) keeps it valid
+    if not isinstance(depsgraph, bpy.types.Depsgraph) or depsgraph.id_type_updated('GPENCIL'):
+        cache['generation'] += 1
+        if not isinstance(depsgraph, bpy.types.Depsgraph):
+            # undo / file load: pointers of frames and strokes may be reused
+            cache['frames'].clear()
+
+
+def last_stroke(gp_obj):
+    """returns dict of the metadata of the last stroke of the active frame of gp_obj, None if there is none
+    """
+    layer = gp_obj.data.layers.active if gp_obj is not None and gp_obj.type == 'GPENCIL' else None
+    if layer is None or layer.active_frame is None or not layer.active_frame.strokes:
+        return None
+    meta = frame_metadata(layer.active_frame)
+    return {name: values[-1] for name, values in meta.items()}
@@ -0,0 +1,130 @@
+"""binary stroke archives: flat point buffers + per-stroke offsets, readable with numpy memmap
+
+only needs numpy (outside of Blender add the drawchitecture folder to sys.path and use 'import strokeio')
+an archive is a directory with raw little-endian files that can be memory-mapped without copying:
+    header.json   names of GP objects + layers, counts, fields
+    co.f32        (N,3) point coordinates (local space of the GP object)
+    pressure.f32  (N,) point pressure
+    strength.f32  (N,) point strength
+    offsets.i64   (S+1,) points of stroke i are offsets[i]:offsets[i+1]
+    strokes.i32   (S,3) layer index (into header['layers']), frame number, line width
+StrokeWriter streams strokes into the files in chunks, memory stays bounded by the chunk size
+"""
+import json
+import os
+
+import numpy as np
+
+FORMAT = 'drawchitecture-strokes'
+VERSION = 1
+# points collected before the buffers are written to the files
+CHUNK_POINTS = 1 << 20
+
+# explicit little-endian dtypes, archives are read the same on every platform
+FILES = {
+    'co': ('co.f32', '<f4', 3),
+    'pressure': ('pressure.f32', '<f4', 1),
+    'strength': ('strength.f32', '<f4', 1),
+    'offsets': ('offsets.i64', '<i8', 1),
+    'strokes': ('strokes.i32', '<i4', 3),
+}
+
+
+class StrokeWriter:
+    """writes an archive stroke by stroke, use as context manager or call close()
+    """
+
+    def __init__(self, path, chunk_points=CHUNK_POINTS):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_points = chunk_points
+        self.files = {key: open(os.path.join(path, name), 'wb') for key, (name, dtype, width) in FILES.items()}
+        self.objects = []
+        self.layers = []
+        self.points = 0
+        self.strokes = 0
+        self.chunk = {'co': [], 'pressure': [], 'strength': [], 'offsets': [], 'strokes': []}
+        self.chunk_size = 0
+        # first offset
+        self.files['offsets'].write(np.zeros(1, dtype=FILES['offsets'][1]).tobytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add_object(self, name, matrix=None, data_name=None):
+        """returns index of a new GP object, matrix: 4x4 matrix_world
+        """
+        self.objects.append({'name': name, 'data': data_name or name,
+                             'matrix': [list(map(float, row)) for row in matrix] if matrix is not None else None})
+        return len(self.objects) - 1
+
+    def add_layer(self, obj, name):
+        """returns index of a new layer of GP object index obj
+        """
+        self.layers.append({'object': obj, 'name': name})
+        return len(self.layers) - 1
+
+    def add_stroke(self, co, pressure, strength, layer, frame_number=0, line_width=0):
+        """adds one stroke, arrays are copied into the current chunk
+        """
+        n = len(pressure)
+        self.chunk['co'].append(np.array(co, dtype=FILES['co'][1]).reshape(n, 3))
+        self.chunk['pressure'].append(np.array(pressure, dtype=FILES['pressure'][1]))
+        self.chunk['strength'].append(np.array(strength, dtype=FILES['strength'][1]))
+        self.points = self.points + n
+        self.strokes = self.strokes + 1
+        self.chunk['offsets'].append(self.points)
+        self.chunk['strokes'].append((layer, frame_number, line_width))
+        self.chunk_size = self.chunk_size + n
+        if self.chunk_size >= self.chunk_points:
+            self.flush()
+
+    def close(self):
+        """writes the remaining chunk and the header
+        """
+        if self.files is None:
+            return
+        self.flush()
+        for f in self.files.values():
+            f.close()
+        self.files = None
+        header = {'format': FORMAT, 'version': VERSION, 'points': self.points, 'strokes': self.strokes,
+                  'objects': self.objects, 'layers': self.layers,
+                  'files': {key: name for key, (name, dtype, width) in FILES.items()}}
+        with open(os.path.join(self.path, 'header.json'), 'w') as f:
+            json.dump(header, f, indent=1)
+
+    def flush(self):
+        """writes the collected strokes to the files
+        """
+        if not self.chunk['offsets']:
+            return
+        for key in ('co', 'pressure', 'strength'):
+            self.files[key].write(np.concatenate(self.chunk[key]).tobytes())
+        self.files['offsets'].write(np.array(self.chunk['offsets'], dtype=FILES['offsets'][1]).tobytes())
+        self.files['strokes'].write(np.array(self.chunk['strokes'], dtype=FILES['strokes'][1]).tobytes())
+        self.chunk = {key: [] for key in self.chunk}
+        self.chunk_size = 0
+
+
+def read(path, mode='r'):
+    """returns header and dict of memory-mapped arrays of an archive (no data is copied)
+    mode: 'r' read only, 'c' copy on write
+    """
+    with open(os.path.join(path, 'header.json')) as f:
+        header = json.load(f)
+    if header.get('format') != FORMAT:
+        raise ValueError('strokeio: %s is not a stroke archive' % path)
+    counts = {'co': header['points'], 'pressure': header['points'], 'strength': header['points'],
+              'offsets': header['strokes'] + 1, 'strokes': header['strokes']}
+    arrays = {}
+    for key, (name, dtype, width) in FILES.items():
+        shape = (counts[key], width) if width > 1 else (counts[key],)
+        if counts[key] == 0:
+            arrays[key] = np.zeros(shape, dtype=dtype)
+        else:
+            arrays[key] = np.memmap(os.path.join(path, name), dtype=dtype, mode=mode, shape=shape)
+    return header, arrays
@@ -0,0 +1,63 @@
+"""newest stroke of the active GP object, recorded by a depsgraph handler when a stroke is completed
+
+the handler only runs through the active layer + frame when GP data was updated and keeps the
+end points (local space) and the pointer of the last stroke, so V / H / 3D read them without a lookup
+functions in on_stroke_completed are called with the record after a stroke was added in Draw mode
+"""
+import bpy
+
+# last stroke of the active frame of the active GP object, count: strokes in that frame
+last = {'object': None, 'frame': 0, 'pointer': 0, 'count': 0, 'points': 0, 'first': None, 'last': None}
+
+# callbacks (record) after a new stroke was drawn
+on_stroke_completed = []
+
+
+def clear():
+    """forgets the recorded stroke
+    """
+    last.update(object=None, frame=0, pointer=0, count=0, points=0, first=None, last=None)
+
+
+def endpoints(gp_obj):
+    """returns first + last point (local space) of the last stroke of gp_obj as recorded, None if not recorded
+    or if the active frame changed since (checked by pointer + number of strokes only)
+    """
+    if gp_obj is None or last['object'] != gp_obj.name or last['first'] is None:
+        return None
+    frame = gp_obj.data.layers.active.active_frame if gp_obj.data.layers.active else None
+    if frame is None or frame.as_pointer() != last['frame'] or len(frame.strokes) != last['count']:
+        return None
+    return last['first'], last['last']
+
+
+@bpy.app.handlers.persistent
+def update(scene, *args):
+    """handler (depsgraph update): records the last stroke of the active GP object, calls on_stroke_completed
+    when a stroke was added to the same frame in Draw mode
+    undo, redo, file load: the stroke is recorded again without calling on_stroke_completed
+    """
+    depsgraph = args[0] if args else None
+    drawn = isinstance(depsgraph, bpy.types.Depsgraph)
+    if drawn and not depsgraph.id_type_updated('GPENCIL'):
+        return
+    gp_obj = bpy.context.view_layer.objects.active
+    layer = gp_obj.data.layers.active if gp_obj is not None and gp_obj.type == 'GPENCIL' else None
+    frame = layer.active_frame if layer is not None else None
+    if frame is None:
+        clear()
+        return
+
+    strokes = frame.strokes
+    count = len(strokes)
+    stroke = strokes[-1] if count else None
+    pointer = stroke.as_pointer() if stroke is not None else 0
+    added = (drawn and last['object'] == gp_obj.name and last['frame'] == frame.as_pointer()
+             and count == last['count'] + 1 and pointer != last['pointer'])
+    points = stroke.points if stroke is not None else ()
+    last.update(object=gp_obj.name, frame=frame.as_pointer(), pointer=pointer, count=count, points=len(points),
+                first=tuple(points[0].co) if len(points) else None,
+                last=tuple(points[-1].co) if len(points) else None)
+    if added and bpy.context.mode == 'PAINT_GPENCIL':
+        for callback in on_stroke_completed:
+            callback(last)
@@ -0,0 +1,142 @@
+"""runs Drawchitecture tasks on many .blend files in parallel, one headless Blender process per file
+runs under plain CPython, Blender is found via --blender, $BLENDER or PATH:
+python tools/batch.py "blend files/*.blend" [more globs] [--tasks stats,export,simplify,cleanup] \
+    [--jobs N] [--timeout 300] [--epsilon 0.005] [--save] [--output-dir batch_output] [--report batch_report.json]
+tasks: stats (counts), export (stroke archives), simplify (strokes), cleanup (temporary workplane + history)
+changed files are only written with --save, as copies into the output dir
+outputs keep the folders of the files below their common folder, so files of the same name do not collide
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'batch_worker.py')
+RESULT_PREFIX = 'DT_BATCH_RESULT '
+TASKS = ('stats', 'export', 'simplify', 'cleanup')
+
+
+def parse_args():
+    """returns command line arguments
+    """
+    parser = argparse.ArgumentParser(prog='batch.py', description=__doc__.splitlines()[0])
+    parser.add_argument('files', nargs='+', help='.blend files or globs')
+    parser.add_argument('--tasks', default='stats', help='comma separated, of: ' + ', '.join(TASKS))
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='parallel Blender processes')
+    parser.add_argument('--timeout', type=float, default=300.0, help='seconds per file, the process is killed after')
+    parser.add_argument('--epsilon', type=float, default=0.005, help='tolerance of simplify in m')
+    parser.add_argument('--save', action='store_true', help='save changed files as copies into the output dir')
+    parser.add_argument('--output-dir', default='batch_output')
+    parser.add_argument('--report', default='batch_report.json')
+    parser.add_argument('--blender', default=os.environ.get('BLENDER') or shutil.which('blender') or 'blender')
+    config = parser.parse_args()
+    unknown = set(config.tasks.split(',')) - set(TASKS)
+    if unknown:
+        parser.error('unknown tasks: ' + ', '.join(sorted(unknown)))
+    return config
+
+
+def blend_files(patterns):
+    """returns sorted paths of all files matching the globs, each file once
+    """
+    files = set()
+    for pattern in patterns:
+        files.update(os.path.abspath(path) for path in glob.glob(pattern) if path.endswith('.blend'))
+    return sorted(files)
+
+
+def output_names(files):
+    """returns dict of path: output name (path relative to the common folder of all files, without extension)
+    """
+    root = os.path.commonpath([os.path.dirname(path) for path in files]) if files else ''
+    return {path: os.path.splitext(os.path.relpath(path, root))[0] for path in files}
+
+
+def run_file(path, name, config):
+    """runs the worker on one file, outputs are named name, returns its result dict with status ok, error or timeout
+    """
+    command = [config.blender, '--background', '--factory-startup', path, '--python', WORKER, '--',
+               '--tasks', config.tasks, '--output-dir', config.output_dir, '--name', name,
+               '--epsilon', str(config.epsilon)]
+    if config.save:
+        command.append('--save')
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=config.timeout,
+                                 universal_newlines=True)
+    except subprocess.TimeoutExpired:
+        return {'file': path, 'status': 'timeout', 'seconds': time.perf_counter() - start}
+    except OSError as error:
+        return {'file': path, 'status': 'error', 'error': str(error), 'seconds': time.perf_counter() - start}
+
+    lines = [line for line in process.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+    if not lines:
+        return {'file': path, 'status': 'error', 'returncode': process.returncode,
+                'error': process.stderr[-2000:] or process.stdout[-2000:], 'seconds': time.perf_counter() - start}
+    result = json.loads(lines[-1][len(RESULT_PREFIX):])
+    failed = any('error' in task for task in result['tasks'].values())
+    result.update(file=path, status='error' if failed else 'ok', seconds=time.perf_counter() - start)
+    return result
+
+
+def totals(results):
+    """returns sums of the numeric task results over all files that finished, by task
+    """
+    sums = {}
+    for result in results:
+        for name, task in result.get('tasks', {}).items():
+            task_sums = sums.setdefault(name, {})
+            for key, value in task.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    task_sums[key] = task_sums.get(key, 0) + value
+    return sums
+
+
+def main():
+    config = parse_args()
+    files = blend_files(config.files)
+    if not files:
+        print('no .blend files found')
+        return 2
+    config.output_dir = os.path.abspath(config.output_dir)
+    os.makedirs(config.output_dir, exist_ok=True)
+
+    # every job is one Blender process: threads only wait for them
+    start = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, config.jobs)) as pool:
+        futures = [pool.submit(run_file, path, name, config) for path, name in output_names(files).items()]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            print('[%d/%d] %-7s %6.1f s  %s' % (done, len(files), result['status'], result['seconds'],
+                                                 os.path.basename(result['file'])))
+    seconds = time.perf_counter() - start
+
+    results.sort(key=lambda r: r['file'])
+    status = {s: sum(1 for r in results if r['status'] == s) for s in ('ok', 'error', 'timeout')}
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': vars(config),
+        'files': len(files),
+        'status': status,
+        'seconds': seconds,
+        'files_per_second': len(files) / seconds if seconds else 0.0,
+        'totals': totals(r for r in results if r['status'] == 'ok'),
+        'results': results,
+    }
+    with open(config.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print('%d files in %.1f s (%.2f files/s, %d jobs): %d ok, %d error, %d timeout, report: %s'
+          % (len(files), seconds, report['files_per_second'], config.jobs, status['ok'], status['error'],
+             status['timeout'], config.report))
+    return 0 if status['ok'] == len(files) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""runs Drawchitecture tasks on one .blend file inside headless Blender, started by tools/batch.py:
+blender --background --factory-startup <file.blend> --python tools/batch_worker.py -- \
+    --tasks stats,export,simplify,cleanup [--output-dir out] [--name dir/file] [--epsilon 0.005] [--save]
+the result is printed as one JSON line prefixed with RESULT_PREFIX
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import traceback
+
+import bpy
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+import drawchitecture
+from drawchitecture import history
+
+RESULT_PREFIX = 'DT_BATCH_RESULT '
+
+
+def parse_args():
+    """returns arguments passed to the script after '--'
+    """
+    parser = argparse.ArgumentParser(prog='batch_worker.py')
+    parser.add_argument('--tasks', default='stats')
+    parser.add_argument('--output-dir', default='batch_output')
+    parser.add_argument('--name', default='',
+                        help='output path without extension, relative to output-dir (default: name of the file)')
+    parser.add_argument('--epsilon', type=float, default=0.005)
+    parser.add_argument('--save', action='store_true',
+                        help='save the changed file into output-dir (the source file is never overwritten)')
+    return parser.parse_args(sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else [])
+
+
+def output_path(config, extension):
+    """returns <output-dir>/<name><extension>, creates the folders of name
+    """
+    name = config.name or os.path.splitext(os.path.basename(bpy.data.filepath))[0]
+    path = os.path.join(config.output_dir, name + extension)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def gp_objects():
+    """returns all GP objects of the file
+    """
+    return [obj for obj in bpy.data.objects if obj.type == 'GPENCIL']
+
+
+def task_cleanup(config):
+    """removes the temporary workplane, its grid mesh and the unpinned workplane history of every scene
+    """
+    removed = 0
+    wp = bpy.data.objects.get('workplane_TEMPORARY')
+    if wp is not None:
+        drawchitecture.remove_objects([wp])
+        removed = 1
+    entries = sum(history.clear(scene) for scene in bpy.data.scenes)
+    return {'workplanes': removed, 'history_entries': entries}
+
+
+def task_export(config):
+    """writes all strokes into <output-dir>/<name>.dtstrokes
+    """
+    path = output_path(config, '.dtstrokes')
+    return {'path': path, 'points': drawchitecture.export_strokes(path)}
+
+
+def task_simplify(config):
+    """simplifies all strokes of all GP objects with tolerance epsilon
+    """
+    before, after, bytes_before, bytes_after = drawchitecture.simplify_strokes(gp_objects(), config.epsilon)
+    return {'points_before': before, 'points_after': after, 'bytes_before': bytes_before, 'bytes_after': bytes_after}
+
+
+def task_stats(config):
+    """returns number of GP objects, layers, frames, strokes and points of the file
+    """
+    stats = {'objects': 0, 'layers': 0, 'frames': 0, 'strokes': 0, 'points': 0}
+    for gp_obj in gp_objects():
+        stats['objects'] += 1
+        for layer in gp_obj.data.layers:
+            stats['layers'] += 1
+            for frame in layer.frames:
+                stats['frames'] += 1
+                stats['strokes'] += len(frame.strokes)
+                stats['points'] += sum(len(stroke.points) for stroke in frame.strokes)
+    return stats
+
+
+TASKS = {
+    'stats': task_stats,
+    'export': task_export,
+    'simplify': task_simplify,
+    'cleanup': task_cleanup,
+}
+
+
+def main():
+    config = parse_args()
+    drawchitecture.register()
+    result = {'file': bpy.data.filepath, 'tasks': {}}
+    changed = False
+    for name in config.tasks.split(','):
+        start = time.perf_counter()
+        try:
+            result['tasks'][name] = TASKS[name](config)
+        except Exception:
+            result['tasks'][name] = {'error': traceback.format_exc(limit=3)}
+        result['tasks'][name]['ms'] = (time.perf_counter() - start) * 1000
+        changed = changed or name in ('simplify', 'cleanup')
+
+    if config.save and changed:
+        # output_path() creates the output folder, only when something is saved
+        path = output_path(config, '.blend')
+        if os.path.abspath(path) != os.path.abspath(bpy.data.filepath):
+            bpy.ops.wm.save_as_mainfile(filepath=path, copy=True)
+            result['saved'] = path
+    drawchitecture.unregister()
+    print(RESULT_PREFIX + json.dumps(result), flush=True)
+
+
+if __name__ == '__main__':
+    main()